@@ -0,0 +1,260 @@
+"""
+Micro-benchmarks for the Inumaki interpreter.
+
+Run from the repository root:
+
+    python benchmarks/bench.py [benchmark ...]
+
+Every benchmark prints the best wall clock time out of a few repeats. Output written by the
+Inumaki programs themselves is discarded.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src", "inumaki"))
+
+import inu_parallel  # noqa: E402
+from inu_exceptions import InumakiException  # noqa: E402
+from inu_incremental import IncrementalDocument  # noqa: E402
+from inu_interpreter import Interpreter  # noqa: E402
+from inu_lexer import Lexer  # noqa: E402
+from inu_optimizer import optimize  # noqa: E402
+from inu_output import Output  # noqa: E402
+from inu_parser import Parser  # noqa: E402
+from inu_stdlib import create_scope, inu_stdlib  # noqa: E402
+
+REPEATS = 3
+
+INUMAKI = os.path.join(ROOT, "src", "inumaki", "inumaki.py")
+
+
+def read(path):
+    with open(os.path.join(ROOT, path), "r") as file:
+        return file.read()
+
+
+def parse(text, float_numbers=False, optimized=True):
+    lexer = Lexer(text, float_numbers=float_numbers)
+    lexer.scan_tokens()
+    parser = Parser(lexer.tokens)
+    parser.parse()
+    if optimized:
+        optimize(parser.ast)
+    return parser.ast
+
+
+def run_source(text, float_numbers=False, optimized=True):
+    output = Output.memory()
+    ast = parse(text, float_numbers, optimized)
+    interpreter = Interpreter(ast, scope=create_scope(output), cursed=0, output=output)
+    try:
+        interpreter.run()
+    except InumakiException:
+        pass  # some samples overload on purpose
+
+
+def timed(label, func, *args, repeats=REPEATS, **kwargs):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<56} {best * 1000:10.2f} ms")
+
+
+def bench_numbers():
+    """Integer versus legacy all-float number literals on the sample loops."""
+    for path in ["samples/FizzBuzz.inu", "samples/cursed_speech_overload.inu", "benchmarks/counted_loop.inu"]:
+        text = read(path)
+        timed(f"{path} (float numbers)", run_source, text, float_numbers=True)
+        timed(f"{path} (int numbers)", run_source, text)
+
+
+def bench_counted_loop():
+    """samples/FizzBuzz.inu scaled to 10^6 iterations, generic Twist versus range driven."""
+    text = read("benchmarks/fizzbuzz.inu")
+    timed("fizzbuzz 10^6 (generic loop)", run_source, text, optimized=False, repeats=1)
+    timed("fizzbuzz 10^6 (counted loop)", run_source, text, repeats=1)
+
+
+def run_with_print(ast, stream):
+    interpreter = Interpreter(ast, scope=dict(inu_stdlib), cursed=0)
+    with contextlib.redirect_stdout(stream):
+        interpreter.run()
+
+
+def run_with_output(ast, stream, policy):
+    output = Output(stream, policy=policy)
+    with output:
+        Interpreter(ast, scope=create_scope(output), cursed=0, output=output).run()
+
+
+def bench_output():
+    """Print heavy loop writing to a real file: builtin print versus the buffered Output."""
+    ast = parse(read("benchmarks/print_loop.inu"))
+    with open(os.devnull, "w") as devnull, open(os.devnull, "w", buffering=1) as line_buffered:
+        timed("print to line buffered file (old Tuna_Tuna)", run_with_print, ast, line_buffered)
+        timed("Output, line policy", run_with_output, ast, devnull, "line")
+        timed("Output, size policy", run_with_output, ast, devnull, "size")
+        timed("Output, explicit policy", run_with_output, ast, devnull, "explicit")
+        timed("Output, in-memory buffer", run_with_output, ast, io.StringIO(), "explicit")
+
+
+def large_source(lines=50000):
+    samples = [read(f"samples/{name}") for name in ["hello.inu", "FizzBuzz.inu", "cursed_speech_overload.inu"]]
+    text = "\n".join(samples)
+    repeated = "\n".join([text] * (lines // text.count("\n") + 1))
+    return "\n".join(repeated.split("\n")[:lines])
+
+
+def full_parse(text):
+    lexer = Lexer(text)
+    lexer.scan_tokens()
+    Parser(lexer.tokens).parse()
+
+
+def edit_latency(label, document, *edits):
+    """Apply `edits` in turn, timing every application, and report the slowest one."""
+    worst = 0
+    for _ in range(REPEATS):
+        for edit in edits:
+            start = time.perf_counter()
+            document.edit(*edit)
+            worst = max(worst, time.perf_counter() - start)
+    print(f"{label:<56} {worst * 1000:10.2f} ms")
+
+
+def bench_incremental():
+    """Edit latency of IncrementalDocument on a 50k line file against a full lex and parse."""
+    text = large_source()
+    timed("full lex + parse, 50k lines", full_parse, text, repeats=1)
+    timed("IncrementalDocument build, 50k lines", IncrementalDocument, text, repeats=1)
+
+    document = IncrementalDocument(text)
+    line = 25000
+    while document.lines[line - 1].strip() != "Tuna_Tuna(num)":
+        line += 1
+    column = document.lines[line - 1].index("(") + 1
+    edit_latency("type and delete a character", document, (line, column, line, column, "x"),
+                 (line, column, line, column + 1, ""))
+    edit_latency("insert and join a line break", document, (line, 0, line, 0, "\n"), (line, 0, line + 1, 0, ""))
+    edit_latency("open a brace and close it again", document, (line, 0, line, 0, "Twist Tuna {"),
+                 (line, 0, line, len("Twist Tuna {"), ""))
+    edit_latency("open a string to the end of file and close it", document, (line, 0, line, 0, '"'),
+                 (line, 0, line, 1, ""))
+
+
+def bench_operators():
+    """Operator heavy loops: the And conditions of counted_loop.inu and an Or guarding a call."""
+    timed("benchmarks/counted_loop.inu", run_source, read("benchmarks/counted_loop.inu"))
+    timed("benchmarks/short_circuit.inu", run_source, read("benchmarks/short_circuit.inu"))
+
+
+def bench_calls():
+    """Call heavy programs: recursive fib plus a loop calling a function and builtins, then builtins alone."""
+    timed("benchmarks/calls.inu", run_source, read("benchmarks/calls.inu"))
+    timed("benchmarks/builtin_calls.inu", run_source, read("benchmarks/builtin_calls.inu"))
+
+
+def bench_strings():
+    """A 10MB string built by appending 100 characters at a time."""
+    timed("benchmarks/build_string.inu", run_source, read("benchmarks/build_string.inu"), repeats=1)
+
+
+def bench_stop():
+    """Early exit search loops: Stop against forcing the loop condition false."""
+    timed("search, condition made false", run_source, read("benchmarks/search_flag.inu"))
+    timed("search, Stop", run_source, read("benchmarks/search_stop.inu"))
+
+
+def bench_specialize():
+    """Float only arithmetic and comparisons, where every operator node gets specialized."""
+    timed("benchmarks/float_loop.inu", run_source, read("benchmarks/float_loop.inu"))
+    timed("benchmarks/counted_loop.inu", run_source, read("benchmarks/counted_loop.inu"))
+
+
+def run_with_workers(text, workers):
+    inu_parallel.WORKERS = workers
+    run_source(text)
+
+
+def bench_parallel():
+    """Parallel_Reduce over fib calls, run in the parent versus spread over worker processes."""
+    text = read("benchmarks/parallel.inu")
+    workers = os.cpu_count() or 1
+    try:
+        timed("Parallel_Reduce, 1 worker (sequential)", run_with_workers, text, 1)
+        timed(f"Parallel_Reduce, {max(workers, 2)} workers", run_with_workers, text, max(workers, 2))
+    finally:
+        inu_parallel.WORKERS = workers
+
+
+def run_catching(ast, runs, show=False):
+    """Embedder loop running a failing program again and again, catching every error."""
+    for _ in range(runs):
+        output = Output.memory()
+        try:
+            Interpreter(ast, scope=create_scope(output), cursed=0, output=output).run()
+        except InumakiException as e:
+            if show:
+                str(e)
+
+
+def bench_errors():
+    """A division by zero four calls deep, raised and caught 20000 times."""
+    ast = parse(read("benchmarks/nested_error.inu"))
+    timed("20000 errors caught", run_catching, ast, 20000)
+    timed("20000 errors caught and formatted", run_catching, ast, 20000, show=True)
+
+
+def start(script, cache=None):
+    """Run `script` in a new interpreter process, removing the module cache directory first if given."""
+    if cache is not None:
+        shutil.rmtree(cache, ignore_errors=True)
+    subprocess.run([sys.executable, INUMAKI, script], stdout=subprocess.DEVNULL, check=True)
+
+
+def bench_startup():
+    """Whole process runs: a script without imports, and one importing a 5000 function module."""
+    timed("samples/hello.inu (no imports)", start, os.path.join(ROOT, "samples", "hello.inu"), repeats=10)
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "library.inu"), "w") as file:
+            file.writelines(f"Tuna_Mayo f{i} Tuna x Tuna {{\n    Return x + {i}\n}}\n" for i in range(5000))
+        script = os.path.join(directory, "main.inu")
+        with open(script, "w") as file:
+            file.write("Salmon_Roe library\nSalmon_Roe math\nTuna_Tuna(library.f4999(math.floor(1.5)))\n")
+        cache = os.path.join(directory, "__inucache__")
+        timed("import 5000 functions, compiled", start, script, cache)
+        timed("import 5000 functions, from __inucache__", start, script)
+
+
+BENCHMARKS = {
+    "numbers": bench_numbers,
+    "counted_loop": bench_counted_loop,
+    "output": bench_output,
+    "incremental": bench_incremental,
+    "errors": bench_errors,
+    "operators": bench_operators,
+    "calls": bench_calls,
+    "strings": bench_strings,
+    "parallel": bench_parallel,
+    "stop": bench_stop,
+    "startup": bench_startup,
+    "specialize": bench_specialize,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"== {name}")
+        BENCHMARKS[name]()
@@ -1,3 +1,7 @@
+from inu_operators import BINARY_OPERATORS, SHORT_CIRCUIT, UNARY_OPERATORS
+from inu_specialize import RESPECIALIZATIONS, WARMUP
+
+
 class Set:
     def __init__(self, name, value, cursed=0):
         self.name = name
@@ -8,9 +12,10 @@ class Set:
 
 
 class Var:
-    def __init__(self, name, cursed=0):
+    def __init__(self, name, cursed=0, token=None):
         self.name = name
         self.cursed = cursed
+        self.token = token  # token the node came from, for error positions
 
     __match_args__ = ("name", "cursed")
 
@@ -50,6 +55,7 @@ class For:
         self.increment = increment
         self.body = body
         self.cursed = cursed
+        self.counted = None  # CountedLoop filled in by inu_optimizer
 
     __match_args__ = ("variable", "condition", "increment", "body", "cursed")
 
@@ -64,28 +70,33 @@ class While:
 
 
 class Call:
-    def __init__(self, name, args, cursed=0):
+    def __init__(self, name, args, cursed=0, token=None):
         self.name = name
         self.args = args
         self.cursed = cursed
+        self.token = token
+        self.builtin = None  # the inu_stdlib function the callee names, see inu_optimizer.resolve_builtins
 
     __match_args__ = ("name", "args", "cursed")
 
 
 class Get:
-    def __init__(self, obj, prop, cursed=0):
+    def __init__(self, obj, prop, cursed=0, token=None):
         self.obj = obj
         self.prop = prop
         self.cursed = cursed
+        self.token = token
 
     __match_args__ = ("obj", "prop", "cursed")
 
 
 class UnaryOp:
-    def __init__(self, op, right, cursed=0):
+    def __init__(self, op, right, cursed=0, token=None):
         self.op = op
         self.right = right
         self.cursed = cursed
+        self.token = token
+        self.fn = UNARY_OPERATORS.get(op)  # None for an unknown operator
 
     __match_args__ = ("op", "right", "cursed")
 
@@ -96,17 +107,57 @@ class BinaryOp:
         self.op = op
         self.right = right
         self.cursed = cursed
+        # Resolved once here, And/Or have no function but the left operand truth that ends them
+        self.fn = BINARY_OPERATORS.get(op.value)
+        self.short_circuit = SHORT_CIRCUIT.get(op.value)
+        # Operand type specialization, see inu_specialize
+        self.fast = None
+        self.observed = None
+        self.warmup = WARMUP if self.fn is not None else 0
+        self.respecializations = RESPECIALIZATIONS
 
     __match_args__ = ("left", "op", "right", "cursed")
 
 
 class Literal:
-    def __init__(self, value, cursed=0):
+    def __init__(self, value, cursed=0, token=None):
         self.value = value
         self.cursed = cursed
+        self.token = token
 
     __match_args__ = ("value", "cursed")
 
 
 class CoughSyrup:
     pass
+
+
+class Stop:
+    """Leaves the innermost loop."""
+
+    def __init__(self, cursed=0, token=None):
+        self.cursed = cursed
+        self.token = token
+
+    __match_args__ = ("cursed",)
+
+
+class Run:
+    """Skips the rest of the innermost loop's body and carries on with the next iteration."""
+
+    def __init__(self, cursed=0, token=None):
+        self.cursed = cursed
+        self.token = token
+
+    __match_args__ = ("cursed",)
+
+
+class Import:
+    """Binds the module called `name` to that name, loading it the first time it is imported."""
+
+    def __init__(self, name, cursed=0, token=None):
+        self.name = name
+        self.cursed = cursed
+        self.token = token
+
+    __match_args__ = ("name", "cursed")
@@ -0,0 +1,497 @@
+"""
+Static cursed speech analysis.
+
+`inumaki check` walks the tree without running it and tracks lower and upper bounds of the
+cursed speech counter at every point the interpreter compares it against the threshold. A
+program whose lower bound crosses the threshold on every path is guaranteed to end in a
+CursedSpeechOverloadError and can be refused before it wastes any time running.
+
+The bounds follow the interpreter exactly:
+
+- Var, Literal, Set, Function, Return, Conditional, For and While charge their own weight
+- the right operand of And/Or is only charged when the left operand does not decide the result
+- the counter is checked after every statement of every block
+- Cough_Syrup resets the counter to zero
+- a call charges the function body to the interpreter that defined the function; those charges
+  only reach the caller when the call is made from that same block, otherwise they are lost
+  when the enclosing block hands its own counter back
+- Twist loops with literal bounds run a known number of times, other loops any number of times
+- Stop leaves the loop and Run goes on with its next iteration, both after the threshold check
+- Salmon_Roe charges its own weight, the module it loads runs on a counter of its own
+
+An overload is only reported as guaranteed when no statement on the way may stop the program
+some other way: a division or modulo by anything but a nonzero number literal, indexing, a
+call to a builtin that can raise or to an unknown function, recursion (which may run out of
+stack) and an import all count as possible other exits. Beyond those, "guaranteed" assumes
+the program's names are defined and its operands have types the operators accept.
+"""
+
+import argparse
+import sys
+
+from inu_ast import (
+    BinaryOp,
+    Call,
+    Conditional,
+    CoughSyrup,
+    For,
+    Function,
+    Get,
+    Import,
+    Literal,
+    Return,
+    Run,
+    Set,
+    Stop,
+    UnaryOp,
+    Var,
+    While,
+)
+from inu_exceptions import CURSED_SPEECH_THRESHOLD, InumakiException
+from inu_lexer import Token
+from inu_modules import compile_source
+from inu_optimizer import match_counted_loop
+from inu_stdlib import CALLBACK_BUILTINS, inu_stdlib
+
+# Stands in for a name whose value the analysis cannot follow
+UNKNOWN = object()
+
+# Builtins that never raise, whatever they are given
+SAFE_BUILTINS = {"Tuna_Tuna", "str"}
+
+# Loop iterations simulated one by one before the loop is treated as running any number of times
+MAX_UNROLL = 1024
+
+
+class Frame:
+    """One block execution, which the interpreter runs in its own Interpreter instance."""
+
+    def __init__(self, function=None):
+        self.function = function  # FunctionContext of the enclosing function body, if any
+
+
+class FunctionContext:
+    def __init__(self):
+        self.returns = []  # states at every Return
+
+
+class LoopContext:
+    def __init__(self):
+        self.stop = None  # states at every Stop, joined
+        self.run = None  # states at every Run, joined
+
+
+class State:
+    """Bounds of the cursed counter plus the functions known to be bound to each name."""
+
+    def __init__(self, lower, upper, functions):
+        self.lower = lower
+        self.upper = upper
+        self.functions = functions  # name -> (Function node, defining Frame) or UNKNOWN
+
+    def charge(self, cursed, cap):
+        if not cursed:
+            return self
+        return State(min(self.lower + cursed, cap), min(self.upper + cursed, cap), self.functions)
+
+    def bind(self, name, value):
+        return State(self.lower, self.upper, {**self.functions, name: value})
+
+    def __eq__(self, other):
+        return (self.lower, self.upper, self.functions) == (other.lower, other.upper, other.functions)
+
+
+def join(*states):
+    """Combine the states of alternative paths, None being a path that never continues."""
+    states = [state for state in states if state is not None]
+    if not states:
+        return None
+    if len(states) == 1:
+        return states[0]
+
+    functions = dict(states[0].functions)
+    for state in states[1:]:
+        for name in functions.keys() | state.functions.keys():
+            if functions.get(name) is not state.functions.get(name):
+                functions[name] = UNKNOWN
+    return State(min(s.lower for s in states), max(s.upper for s in states), functions)
+
+
+def nonzero_number(node):
+    """Whether `node` is a number literal other than zero, a divisor that cannot fail."""
+    return isinstance(node, Literal) and type(node.value) in (int, float) and node.value != 0
+
+
+def node_line(node):
+    """Line of the first token found in `node`, if the parser kept any."""
+    if isinstance(node, Token):
+        return node.line
+    if isinstance(node, list):
+        children = node
+    elif hasattr(node, "__dict__"):
+        children = vars(node).values()
+    else:
+        return None
+    for child in children:
+        line = node_line(child)
+        if line is not None:
+            return line
+    return None
+
+
+class CheckReport:
+    def __init__(self, analyzer, final):
+        self.threshold = analyzer.threshold
+        self.final = final
+        self.peak = analyzer.peak
+        self.overloads = sorted(analyzer.overloads.items(), key=lambda item: item[0] or 0)
+        self.warnings = sorted(analyzer.warnings.items(), key=lambda item: item[0] or 0)
+        self.guaranteed = final is None and bool(analyzer.overloads) and not analyzer.other_exits
+
+    def bound(self, value):
+        return f">{self.threshold}" if value > self.threshold else str(value)
+
+    def format(self):
+        lines = []
+        if self.guaranteed:
+            lines.append(f"Guaranteed cursed speech overload (threshold {self.threshold})")
+        elif self.warnings or self.overloads:
+            lines.append(f"Possible cursed speech overload (threshold {self.threshold})")
+        else:
+            lines.append(f"No cursed speech overload (threshold {self.threshold})")
+
+        for line, lower in self.overloads:
+            where = f"line {line}" if line is not None else "unknown line"
+            lines.append(f"  overloads at {where} on every path that reaches it")
+        if self.overloads and not self.guaranteed:
+            lines.append("  unless the program stops earlier some other way, such as with an error")
+        for line, upper in self.warnings:
+            where = f"line {line}" if line is not None else "unknown line"
+            lines.append(f"  may overload at {where}")
+
+        if self.final is not None:
+            lines.append(f"  cursed speech at exit: {self.final.lower} to {self.bound(self.final.upper)}")
+        lines.append(f"  peak cursed speech: up to {self.bound(self.peak)}")
+        return "\n".join(lines)
+
+
+class Analyzer:
+    def __init__(self, threshold=CURSED_SPEECH_THRESHOLD, builtins=inu_stdlib):
+        self.threshold = threshold
+        self.cap = threshold + 1  # every count above the threshold behaves the same
+        self.builtins = builtins
+        self.peak = 0
+        self.overloads = {}  # line -> lower bound of the count there
+        self.warnings = {}  # line -> upper bound of the count there
+        self.other_exits = False  # some path stops without overloading (endless loop, top-level Return)
+        self.active = set()
+        self.summaries = {}
+        self.loops = []  # LoopContext of every loop body being analysed, innermost last
+
+    def check(self, ast):
+        final = self.block(ast, State(0, 0, {}), None)
+        return CheckReport(self, final)
+
+    def checkpoint(self, state, node):
+        """The interpreter's threshold check after a statement."""
+        self.peak = max(self.peak, state.upper)
+        if state.lower > self.threshold:
+            line = node_line(node)
+            self.overloads[line] = min(self.overloads.get(line, state.lower), state.lower)
+            return None
+        if state.upper > self.threshold:
+            line = node_line(node)
+            self.warnings[line] = max(self.warnings.get(line, state.upper), state.upper)
+        return state
+
+    def block(self, body, state, function):
+        frame = Frame(function)
+        for node in body or []:
+            state = self.statement(node, state, frame)
+            if state is None:
+                return None
+            state = self.checkpoint(state, node)
+            if state is None:
+                return None
+            if isinstance(node, Stop):
+                self.loops[-1].stop = join(self.loops[-1].stop, state)
+                return None
+            if isinstance(node, Run):
+                self.loops[-1].run = join(self.loops[-1].run, state)
+                return None
+        return state
+
+    def loop_body(self, body, state, frame, context):
+        """One pass over a loop body. Returns the state going on to the next iteration."""
+        self.loops.append(LoopContext())
+        try:
+            state = self.block(body, state, frame.function)
+        finally:
+            inner = self.loops.pop()
+        context.stop = join(context.stop, inner.stop)
+        return join(state, inner.run)
+
+    def statement(self, node, state, frame):
+        match node:
+            case Set(name, value, cursed):
+                state = self.expression(value, state.charge(cursed, self.cap), frame)
+                if state is None:
+                    return None
+                if name.value in state.functions or name.value in self.builtins:
+                    state = state.bind(name.value, UNKNOWN)
+                return state
+            case Function(name, _, _, cursed):
+                return state.charge(cursed, self.cap).bind(name.value, (node, frame))
+            case Return(value, cursed):
+                state = self.expression(value, state.charge(cursed, self.cap), frame)
+                if state is not None:
+                    if frame.function is None:
+                        self.other_exits = True  # Return outside a function stops the program
+                    else:
+                        frame.function.returns.append(state)
+                return None
+            case Conditional(condition, body, else_body, cursed):
+                state = self.expression(condition, state.charge(cursed, self.cap), frame)
+                if state is None:
+                    return None
+                taken = constant_truth(condition)
+                if taken is True:
+                    return self.block(body, state, frame.function)
+                if taken is False:
+                    return self.block(else_body, state, frame.function)
+                return join(self.block(body, state, frame.function), self.block(else_body, state, frame.function))
+            case For(variable, condition, increment, body, cursed):
+                state = self.block([variable], state.charge(cursed, self.cap), frame.function)
+                if state is None:
+                    return None
+                context = LoopContext()
+
+                def iteration(state):
+                    state = self.expression(condition, state, frame)
+                    if state is not None:
+                        state = self.loop_body(body, state, frame, context)
+                    if state is not None:
+                        state = self.statement(increment, state, frame)
+                    return state
+
+                return join(self.loop(iteration, condition, state, frame, trip_count(node)), context.stop)
+            case While(condition, body, cursed):
+                context = LoopContext()
+
+                def iteration(state):
+                    state = self.expression(condition, state, frame)
+                    if state is not None:
+                        state = self.loop_body(body, state, frame, context)
+                    return state
+
+                state = state.charge(cursed, self.cap)
+                return join(self.loop(iteration, condition, state, frame, trip_count(node)), context.stop)
+            case CoughSyrup():
+                return State(0, 0, state.functions)
+            case Stop(cursed) | Run(cursed):
+                return state.charge(cursed, self.cap)
+            case Import(name, cursed):
+                state = state.charge(cursed, self.cap)
+                self.other_exits = True  # the module may be missing or fail while it runs
+                if name.value in state.functions or name.value in self.builtins:
+                    state = state.bind(name.value, UNKNOWN)
+                return state
+            case _:
+                return self.expression(node, state, frame)
+
+    def loop(self, iteration, condition, state, frame, trips):
+        """
+        Run `iteration` `trips` times (None: unknown, float("inf"): until the program stops) and
+        evaluate the condition once more for the check that ends the loop.
+        """
+        count = 0
+        while trips is not None and count < trips:
+            if count >= MAX_UNROLL:
+                break  # give up on counting, treat the rest as any number of iterations
+            following = iteration(state)
+            if following is None:
+                return None
+            count += 1
+            if following == state:
+                if trips == float("inf"):
+                    self.other_exits = True  # loops forever without overloading
+                    return None
+                # Every remaining iteration ends in the same state
+                return self.expression(condition, state, frame)
+            state = following
+        else:
+            if trips is not None:
+                return self.expression(condition, state, frame)
+
+        # Any number of iterations: widen the loop head until it stops changing
+        head = state
+        while True:
+            following = join(head, iteration(head))
+            if following == head:
+                break
+            head = following
+        if trips == float("inf"):
+            self.other_exits = True
+            return None
+        return self.expression(condition, head, frame)
+
+    def expression(self, node, state, frame):
+        match node:
+            case Var(_, cursed) | Literal(_, cursed):
+                return state.charge(cursed, self.cap)
+            case UnaryOp(_, right):
+                return self.expression(right, state, frame)
+            case BinaryOp(left, _, right) if node.short_circuit is not None:
+                # And/Or only evaluate the right operand when the left one does not decide
+                state = self.expression(left, state, frame)
+                if state is None:
+                    return None
+                truth = constant_truth(left)
+                if truth is node.short_circuit:
+                    return state
+                evaluated = self.expression(right, state, frame)
+                return evaluated if truth is not None else join(state, evaluated)
+            case BinaryOp(left, op, right):
+                state = self.expression(left, state, frame)
+                state = state and self.expression(right, state, frame)
+                if state is not None and op.value in ("/", "%") and not nonzero_number(right):
+                    self.other_exits = True  # may stop with a division by zero instead
+                return state
+            case Get(obj, prop):
+                state = self.expression(obj, state, frame)
+                state = state and self.expression(prop, state, frame)
+                if state is not None:
+                    self.other_exits = True  # may stop on a missing index or property instead
+                return state
+            case Call(name, args):
+                state = self.expression(name, state, frame)
+                for arg in args:
+                    if state is None:
+                        return None
+                    state = self.expression(arg, state, frame)
+                if state is None:
+                    return None
+                callee = state.functions.get(name.name) if isinstance(name, Var) else UNKNOWN
+                if callee is None and (name.name not in self.builtins or name.name in CALLBACK_BUILTINS):
+                    callee = UNKNOWN
+                if callee is UNKNOWN or (callee is None and name.name not in SAFE_BUILTINS):
+                    self.other_exits = True  # may raise instead of returning
+                return self.call(callee, state, frame)
+            case _:
+                return state
+
+    def call(self, callee, state, frame):
+        if callee is None:
+            return state  # a builtin
+        if callee is UNKNOWN:
+            # Anything may happen, including a Cough_Syrup
+            self.peak = self.cap
+            return State(0, self.cap, state.functions)
+
+        function, defined_in = callee
+        same_interpreter = defined_in is frame
+        if function in self.active:
+            # Recursion: the nested call is never made from the defining block, and deep enough
+            # recursion ends the program with an error before any overload
+            self.peak = self.cap
+            self.other_exits = True
+            return state
+
+        # Outside the defining block the function runs on a counter left behind earlier
+        if same_interpreter:
+            entry = state
+        else:
+            entry = State(0, self.peak, state.functions)
+        key = (id(function), entry.lower, entry.upper, same_interpreter)
+        if key not in self.summaries:
+            self.active.add(function)
+            try:
+                self.summaries[key] = self.function_body(function, entry)
+            finally:
+                self.active.discard(function)
+        result = self.summaries[key]
+
+        if result is None:
+            return None  # the overload inside the body ends the program
+        if not same_interpreter:
+            return state  # the charges went to another interpreter's counter
+        return State(result.lower, result.upper, state.functions)
+
+    def function_body(self, function, entry):
+        params = {param.value for param in function.params}
+        functions = {name: value for name, value in entry.functions.items() if name not in params}
+        context = FunctionContext()
+        fallthrough = self.block(function.body, State(entry.lower, entry.upper, functions), context)
+        result = join(fallthrough, *context.returns)
+        if result is None:
+            return None
+        return result.charge(sum(getattr(node, "cursed", 0) for node in function.body), self.cap)
+
+
+def constant_truth(condition):
+    """Truth value of a condition that is known before running, otherwise None."""
+    match condition:
+        case Literal(value):
+            return bool(value)
+        case UnaryOp(op, right) if op in ("!", "Not"):
+            truth = constant_truth(right)
+            return None if truth is None else not truth
+    return None
+
+
+def trip_count(node):
+    """Number of times a loop body runs when it is fixed by literals, otherwise None."""
+    if isinstance(node, While):
+        truth = constant_truth(node.condition)
+        if truth is None:
+            return None
+        return float("inf") if truth else 0
+
+    truth = constant_truth(node.condition)
+    if truth is not None:
+        return float("inf") if truth else 0
+    loop = match_counted_loop(node)
+    start = node.variable.value
+    if loop is None or not isinstance(loop.bound, Literal) or not isinstance(start, Literal):
+        return None
+    if type(start.value) is not int:
+        return None
+    bound = loop.bound.value
+    if loop.inclusive:
+        bound += 1 if loop.step > 0 else -1
+    return len(range(start.value, bound, loop.step))
+
+
+def check_source(text, threshold=CURSED_SPEECH_THRESHOLD, float_numbers=False):
+    return Analyzer(threshold).check(compile_source(text, float_numbers=float_numbers))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="inumaki check",
+        description="Find programs that are guaranteed to overload on cursed speech without running them",
+    )
+    parser.add_argument("file", type=str, help="Inumaki source code file")
+    parser.add_argument("--threshold", type=int, default=CURSED_SPEECH_THRESHOLD, help="cursed speech threshold")
+    parser.add_argument(
+        "--float-numbers",
+        action="store_true",
+        help="treat every number literal as a float (behaviour of older Inumaki versions)",
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.file, "r") as file:
+        text = file.read()
+    try:
+        report = check_source(text, args.threshold, args.float_numbers)
+    except InumakiException as e:
+        print(f"Error in {args.file}:", file=sys.stderr)
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{args.file}: {report.format()}")
+    sys.exit(2 if report.guaranteed else 0)
+
+
+if __name__ == "__main__":
+    main()
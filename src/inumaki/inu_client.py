@@ -0,0 +1,159 @@
+"""
+Thin client for `inumaki serve`.
+
+Accepts the same arguments as inumaki.py but hands the work to a running server, so a run
+only pays for starting this small script. The interactive shell runs its lines in one server
+session, so names defined on one line are there on the next, and holds on to a server worker
+until it exits. Apart from the standard library only inu_output (and inu_specialize for
+--profile) is imported on purpose: importing the interpreter here would bring back the
+startup cost.
+
+The server's socket is looked for at $INUMAKI_SOCKET, else in $XDG_RUNTIME_DIR, else in an
+`inumaki-<uid>` directory of the temporary directory that only its owner may enter. Source is
+only sent to a socket that belongs to the user running the client.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+from collections import Counter
+
+from inu_output import FLUSH_POLICIES, DEFAULT_BUFFER_SIZE, Output
+
+# Directory for the socket when there is no $XDG_RUNTIME_DIR, created by the server with mode 0700
+PRIVATE_DIRECTORY = os.path.join(tempfile.gettempdir(), f"inumaki-{os.getuid()}")
+DEFAULT_SOCKET = os.environ.get("INUMAKI_SOCKET") or os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or PRIVATE_DIRECTORY, "inumaki.sock"
+)
+
+parser = argparse.ArgumentParser(prog="inumaki-client", description="Run Inumaki code on an inumaki server")
+parser.add_argument("file", type=str, help="Inumaki source code file", nargs="?", default=None)
+parser.add_argument(
+    "--float-numbers",
+    action="store_true",
+    help="treat every number literal as a float (behaviour of older Inumaki versions)",
+)
+parser.add_argument("--output", type=str, default=None, help="write program output to this file instead of stdout")
+parser.add_argument(
+    "--flush",
+    choices=FLUSH_POLICIES,
+    default=None,
+    help="when buffered output is flushed (default: line on a terminal, size otherwise)",
+)
+parser.add_argument("--buffer-size", type=int, default=DEFAULT_BUFFER_SIZE, help="buffer size for --flush size")
+parser.add_argument(
+    "--profile",
+    action="store_true",
+    help="report on stderr how many operator nodes were specialized and how often their guards failed",
+)
+parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET, help="Unix socket of the server")
+
+
+class Client:
+    """
+    A connection to the server at `socket_path`. Raises ConnectionError with a message fit for
+    the user when no server of this user listens there.
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET):
+        try:
+            info = os.stat(socket_path)
+        except FileNotFoundError:
+            raise ConnectionError(f"no inumaki server at {socket_path}") from None
+        if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+            raise ConnectionError(f"{socket_path} is not an inumaki server socket of yours, not using it")
+
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.connection.connect(socket_path)
+        except OSError:
+            self.connection.close()
+            raise ConnectionError(f"no inumaki server at {socket_path}") from None
+        self.stream = self.connection.makefile("rwb")
+
+    def request(self, **request):
+        self.stream.write(json.dumps(request).encode() + b"\n")
+        self.stream.flush()
+        return json.loads(self.stream.readline())
+
+    def close(self):
+        self.stream.close()
+        self.connection.close()
+
+
+def report(response, output, filename=None):
+    """Write a server response the way inumaki.py reports a local run. Returns the exit status."""
+    output.write(response["output"])
+    if response["error"] is None:
+        return 0
+
+    # Anything printed before the error should appear before the error message
+    output.flush()
+    if response["unexpected"]:
+        where = f" in {filename}" if filename else ""
+        print(f"Unexpected error{where}: {response['error']}", file=sys.stderr)
+    else:
+        if filename:
+            print(f"Error in {filename}:", file=sys.stderr)
+        print(response["error"], file=sys.stderr)
+    return 1
+
+
+def print_profile(counts):
+    from inu_specialize import report as profile_report
+
+    for line in profile_report(counts):
+        print(line, file=sys.stderr)
+
+
+def main():
+    args = parser.parse_args()
+    try:
+        client = Client(args.socket)
+    except ConnectionError as e:
+        print(f"inumaki-client: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    policy = args.flush
+    if policy is None:
+        policy = "line" if args.output is None and sys.stdout.isatty() else "size"
+    output = Output(args.output, policy=policy, buffer_size=args.buffer_size)
+    atexit.register(output.close)
+    counts = Counter()
+    if args.profile:
+        atexit.register(print_profile, counts)
+
+    def run(**request):
+        response = client.request(float_numbers=args.float_numbers, profile=args.profile, **request)
+        counts.update(response.get("profile", {}))
+        return response
+
+    if args.file:
+        response = run(path=os.path.abspath(args.file))
+        client.close()
+        status = report(response, output, args.file)
+        output.flush()
+        sys.exit(status)
+
+    print("Inumaki Interactive Shell")
+    print("Enter Inumaki code (Ctrl+C or Ctrl+D to exit)")
+    while True:
+        try:
+            text = input("inumaki> ")
+        except (EOFError, KeyboardInterrupt):
+            print("\nBye!")
+            break
+
+        if text.strip():  # Only run if there's actual content
+            report(run(source=text, cwd=os.getcwd(), session="repl"), output)
+            output.flush()
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
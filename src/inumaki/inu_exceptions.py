@@ -5,35 +5,121 @@ This module provides structured exception classes with descriptive error message
 context information, and helpful suggestions for common issues.
 """
 
+import bisect
+
 # Constants
 CURSED_SPEECH_THRESHOLD = 100  # Maximum allowed cursed speech usage before throat irritation
 
 
+class SourceIndex:
+    """Start offsets of every line of a source text, built once so errors can look lines up cheaply."""
+
+    def __init__(self, text):
+        self.text = text
+        self.line_starts = [0]
+        newline = text.find("\n")
+        while newline != -1:
+            self.line_starts.append(newline + 1)
+            newline = text.find("\n", newline + 1)
+
+    def line_text(self, line):
+        """Text of a 1-based line without its line break, or None when out of range."""
+        if line is None or not 1 <= line <= len(self.line_starts):
+            return None
+        start = self.line_starts[line - 1]
+        end = self.line_starts[line] - 1 if line < len(self.line_starts) else len(self.text)
+        return self.text[start:end]
+
+    def position(self, offset):
+        """1-based line and 0-based column of a character offset."""
+        line = bisect.bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1]
+
+
 class InumakiException(Exception):
-    """Base exception class for all Inumaki interpreter errors."""
+    """
+    Base exception class for all Inumaki interpreter errors.
+
+    Nothing is formatted when the exception is raised. The message may be given as a callable,
+    and the full text, including the code snippet looked up through `source`, is only built the
+    first time the exception is turned into a string.
+
+    An error raised because of another one keeps it in `wrapped`, and its message then leads into
+    the text of the wrapped error. A runaway recursion builds a chain of those as deep as the call
+    stack was, so the chain is formatted in one loop over it rather than one call per level.
+    """
     
-    def __init__(self, message, line=None, column=None, code_snippet=None, suggestion=None):
-        self.message = message
+    def __init__(self, message, line=None, column=None, code_snippet=None, suggestion=None, source=None):
+        self._message = message
         self.line = line
         self.column = column
         self.code_snippet = code_snippet
         self.suggestion = suggestion
-        super().__init__(self._format_message())
+        self.source = source  # SourceIndex of the text the error was found in
+        self.wrapped = None  # InumakiException whose text follows the message
+        self._formatted = None
+        super().__init__()
+
+    @property
+    def message(self):
+        if self.wrapped is not None:
+            return self._lead() + str(self.wrapped)
+        return self._lead()
+
+    def _lead(self):
+        if callable(self._message):
+            self._message = self._message()
+        return self._message
+
+    def __str__(self):
+        key = (self.line, self.column, self.code_snippet, self.source)
+        if self._formatted is None or self._formatted[0] != key:
+            try:
+                self._formatted = (key, self._format_message())
+            except RecursionError:
+                return f"{self.__class__.__name__}: (error nested too deeply to show)"
+        return self._formatted[1]
     
+    def __reduce__(self):
+        state = dict(self.__dict__, _message=self.message, wrapped=None, _formatted=None)
+        return _restore_exception, (self.__class__, state)
+
     def _format_message(self):
-        """Format the error message with context and suggestions."""
-        parts = [f"{self.__class__.__name__}: {self.message}"]
+        """Format the error message with context and suggestions, and those of the errors it wraps."""
+        heads = []
+        tails = []
+        error = self
+        while error is not None:
+            heads.append(f"{error.__class__.__name__}: {error._lead()}")
+            tails.append(error._format_context())
+            error = error.wrapped
+        return "".join(heads) + "".join(reversed(tails))
+
+    def _format_context(self):
+        """The lines following the message: position, code snippet and suggestion."""
+        parts = []
         
         if self.line is not None:
-            parts.append(f"  at line {self.line}" + (f", column {self.column}" if self.column else ""))
+            parts.append(f"\n  at line {self.line}" + (f", column {self.column}" if self.column else ""))
         
-        if self.code_snippet:
-            parts.append(f"  Code: {self.code_snippet}")
+        code_snippet = self.code_snippet
+        if code_snippet is None and self.source is not None:
+            code_snippet = self.source.line_text(self.line)
+            code_snippet = code_snippet.strip() if code_snippet else None
+        if code_snippet:
+            parts.append(f"\n  Code: {code_snippet}")
         
         if self.suggestion:
-            parts.append(f"  Suggestion: {self.suggestion}")
+            parts.append(f"\n  Suggestion: {self.suggestion}")
         
-        return "\n".join(parts)
+        return "".join(parts)
+
+
+def _restore_exception(cls, state):
+    """Unpickle an InumakiException without running its __init__."""
+    exception = cls.__new__(cls)
+    exception.__dict__.update(state)
+    return exception
 
 
 class InumakiSyntaxError(InumakiException):
@@ -132,14 +218,43 @@ def create_invalid_operator_error(operator, line=None, column=None):
     )
 
 
+def create_outside_loop_error(keyword, line=None, column=None):
+    """Create a descriptive error for Stop or Run outside of a loop."""
+    return InumakiParseError(
+        message=f"'{keyword}' outside of a loop",
+        line=line,
+        column=column,
+        suggestion=f"'{keyword}' can only be used inside the body of a Twist or Plummet loop"
+    )
+
+
+def create_module_not_found_error(name, searched, line=None, column=None):
+    """Create a descriptive error for a module that is neither native nor found on the search path."""
+    return InumakiRuntimeError(
+        message=f"Module not found: '{name}'",
+        line=line,
+        column=column,
+        suggestion=f"Looked for '{name}.inu' in: {', '.join(searched) or 'nowhere'}. "
+        "Add its directory to INUMAKI_PATH or move it next to the script"
+    )
+
+
 def create_function_call_error(func_name, error_detail, line=None, column=None):
-    """Create a descriptive error for function call issues."""
-    return InumakiFunctionError(
-        message=f"Error calling function '{func_name}': {error_detail}",
+    """
+    Create a descriptive error for function call issues. `error_detail` may be the exception
+    raised by the call, it is only turned into text if the message is ever shown.
+    """
+    wrapped = isinstance(error_detail, InumakiException)
+    error = InumakiFunctionError(
+        message=f"Error calling function '{func_name}': " if wrapped
+        else lambda: f"Error calling function '{func_name}': {error_detail}",
         line=line,
         column=column,
         suggestion="Check function name, parameters, and that the function is defined"
     )
+    if wrapped:
+        error.wrapped = error_detail
+    return error
 
 
 def create_invalid_character_error(char, line=None, column=None):
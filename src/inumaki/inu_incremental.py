@@ -0,0 +1,283 @@
+"""
+Incremental lexing and parsing for editors and the REPL.
+
+An IncrementalDocument keeps the tokens of every line and the parsed top-level statements of
+a source text. After an edit only the changed lines are lexed again and only the top-level
+statements around the change are parsed again; everything else, including the AST subtrees
+of untouched statements, is reused.
+
+Lines are lexed independently of each other except where a string literal spans several
+lines, those lines are always lexed together as one chunk.
+"""
+
+from inu_exceptions import InumakiException
+from inu_lexer import TOKENS, Token, Lexer
+from inu_parser import Parser
+
+# Tokens a top-level statement can start with, used to resynchronise after a parse error
+STATEMENT_KEYWORDS = ["Tuna", "Tuna_Mayo", "Return", "Mustard_Leaf", "Twist", "Plummet", "Cough_Syrup", "Stop", "Run",
+                      "Salmon_Roe"]
+
+# Number of lines after an edit handed to the parser before it has to ask for more
+PARSE_WINDOW = 64
+
+
+class Statement:
+    """A parsed top-level statement, or the tokens of one that failed to parse."""
+
+    def __init__(self, first_token, last_token, node, error=None):
+        self.first_token = first_token
+        self.last_token = last_token
+        self.node = node
+        self.error = error
+
+    @property
+    def first_line(self):
+        return self.first_token.line
+
+    @property
+    def last_line(self):
+        return token_end_line(self.last_token)
+
+
+def token_end_line(token):
+    if token.type == TOKENS["String"]:
+        return token.line + token.value.count("\n")
+    return token.line
+
+
+class IncrementalDocument:
+    """
+    Source text with its tokens, top-level statements and diagnostics kept up to date across
+    edits. Lines are numbered from 1 like Token.line, columns are 0-based offsets in a line.
+    """
+
+    def __init__(self, text, float_numbers=False):
+        self.float_numbers = float_numbers
+        self.lines = text.split("\n")
+        self.line_tokens = [[] for _ in self.lines]  # tokens starting on each line
+        self.line_errors = [None for _ in self.lines]  # lexing error reported on each line
+        self.continued = [False for _ in self.lines]  # line is inside a string started above
+        self.statements = []
+
+        self.lex_lines(0, len(self.lines))
+        self.statements = self.parse_from(0, len(self.lines), [])
+
+    @property
+    def text(self):
+        return "\n".join(self.lines)
+
+    @property
+    def tokens(self):
+        tokens = [token for line in self.line_tokens for token in line]
+        tokens.append(self.eof_token(len(self.lines)))
+        return tokens
+
+    @property
+    def ast(self):
+        return [statement.node for statement in self.statements if statement.node is not None]
+
+    @property
+    def diagnostics(self):
+        errors = [error for error in self.line_errors if error is not None]
+        errors.extend(statement.error for statement in self.statements if statement.error is not None)
+        errors.sort(key=lambda error: (error.line or 0, error.column or 0))
+        return errors
+
+    def edit(self, start_line, start_column, end_line, end_column, text):
+        """Replace the text between the two positions with `text` and return the new diagnostics."""
+        start, end = start_line - 1, end_line - 1
+        prefix = self.lines[start][:start_column]
+        suffix = self.lines[end][end_column:]
+        new_lines = (prefix + text + suffix).split("\n")
+        delta = len(new_lines) - (end - start + 1)
+
+        # Widen the replaced range to whole lexing chunks
+        chunk_start = start
+        while self.continued[chunk_start]:
+            chunk_start -= 1
+        chunk_end = end + 1
+        while chunk_end < len(self.lines) and self.continued[chunk_end]:
+            chunk_end += 1
+
+        lines = self.lines[chunk_start:start] + new_lines + self.lines[end + 1:chunk_end]
+        self.lines[chunk_start:chunk_end] = lines
+        self.line_tokens[chunk_start:chunk_end] = [None for _ in lines]
+        self.line_errors[chunk_start:chunk_end] = [None for _ in lines]
+        self.continued[chunk_start:chunk_end] = [None for _ in lines]
+
+        region_end = chunk_start + len(lines)
+        self.clear_lines(chunk_start, region_end)
+        if delta:
+            self.shift_lines(region_end, delta)
+        region_end = self.lex_lines(chunk_start, region_end)
+
+        self.statements = self.parse_from(chunk_start, region_end, self.statements)
+        return self.diagnostics
+
+    def shift_lines(self, first, delta):
+        """Move the tokens and errors from line index `first` on by `delta` lines."""
+        failed = [(statement, statement.first_token.line) for statement in self.statements if statement.error]
+        for tokens in self.line_tokens[first:]:
+            for token in tokens:
+                token.line += delta
+        for error in self.line_errors[first:]:
+            if error is not None:
+                error.line += delta
+        for statement, line in failed:
+            if statement.first_token.line != line and statement.error.line is not None:
+                statement.error.line += delta
+
+    def eof_token(self, line_index):
+        return Token(TOKENS["EOF"], "EOF", None, line_index + 1, 0)
+
+    def lex_lines(self, first, last):
+        """
+        Lex line indices [first, last). The range grows while a string literal runs past its end.
+        Returns the end of the range that was actually lexed.
+        """
+        line = first
+        while line < last:
+            lexer = Lexer("\n".join(self.lines[line:last]), float_numbers=self.float_numbers)
+            lexer.line = line + 1
+            try:
+                lexer.scan_tokens()
+                line = last
+            except InumakiException as e:
+                if e.message.startswith("Unterminated string") and last < len(self.lines):
+                    # A string is still open at the end of the range, take in the next chunk
+                    last += 1
+                    while last < len(self.lines) and self.continued[last]:
+                        last += 1
+                    self.clear_lines(line, last)
+                    continue
+                self.line_errors[e.line - 1] = e
+                if e.message.startswith("Unterminated string"):
+                    # The open string swallows the rest of the document, keep it in one chunk
+                    opened = token_end_line(lexer.tokens[-1]) if lexer.tokens else line + 1
+                    self.continued[opened:last] = [True for _ in range(opened, last)]
+                line = e.line  # carry on with the line after the error
+
+            for token in lexer.tokens:
+                if token.type == TOKENS["EOF"]:
+                    continue
+                self.line_tokens[token.line - 1].append(token)
+                for continued in range(token.line, token_end_line(token)):
+                    self.continued[continued] = True
+        return last
+
+    def clear_lines(self, first, last):
+        self.line_tokens[first:last] = [[] for _ in range(last - first)]
+        self.line_errors[first:last] = [None for _ in range(last - first)]
+        self.continued[first:last] = [False for _ in range(last - first)]
+
+    def is_live(self, token):
+        """Whether `token` is still part of the document rather than one replaced by an edit."""
+        line = token.line - 1
+        return 0 <= line < len(self.lines) and any(other is token for other in self.line_tokens[line])
+
+    def parse_from(self, first, region_end, old_statements):
+        """
+        Parse top-level statements from around line index `first` until the parser lines up with
+        a statement of `old_statements` that lies after the edited lines [first, region_end). That
+        statement is reused together with everything after it.
+        """
+        # First statement reaching into the region. The one before it is parsed again as well,
+        # since the edit may have made it continue.
+        low, high = 0, len(old_statements)
+        while low < high:
+            middle = (low + high) // 2
+            if old_statements[middle].last_line < first + 1:
+                low = middle + 1
+            else:
+                high = middle
+        if low == 0:
+            keep, position = 0, (0, 0)
+        else:
+            keep = low - 1
+            token = old_statements[keep].first_token
+            position = (token.line - 1, self.line_tokens[token.line - 1].index(token))
+
+        # Old statements entirely after the region are candidates for reuse
+        resume = low
+        while resume < len(old_statements):
+            token = old_statements[resume].first_token
+            if token.line - 1 >= region_end and self.is_live(token):
+                break
+            resume += 1
+
+        statements = old_statements[:keep]
+        window_end = min(region_end + PARSE_WINDOW, len(self.lines))
+        while True:
+            # `position` is the first token still to parse, as (line index, index in the line)
+            window = self.window(window_end, position)
+            index = {id(token): i for i, token in enumerate(window)}
+            parser = Parser(window)
+            at_end = window_end >= len(self.lines)
+
+            while True:
+                # Skip old statements the new parse has already swallowed
+                while resume < len(old_statements):
+                    target = index.get(id(old_statements[resume].first_token))
+                    if target is None or target >= parser.pos:
+                        break
+                    resume += 1
+                if resume < len(old_statements) and index.get(id(old_statements[resume].first_token)) == parser.pos:
+                    return statements + old_statements[resume:]
+
+                if parser.peek().type == TOKENS["EOF"]:
+                    if at_end:
+                        return statements
+                    break  # ran out of window, extend it below
+
+                begin = parser.pos
+                try:
+                    node = parser.parse_statement()
+                    error = None
+                except InumakiException as e:
+                    if not at_end and parser.peek().type == TOKENS["EOF"]:
+                        parser.pos = begin
+                        break
+                    node, error = None, e
+                    parser.pos = self.resynchronise(window, begin, parser.pos)
+
+                if parser.peek().type == TOKENS["EOF"] and not at_end:
+                    # The statement may continue past the window
+                    parser.pos = begin
+                    break
+                statements.append(Statement(window[begin], window[parser.pos - 1], node, error))
+
+            # Continue from where this window stopped, with a bigger window
+            if parser.pos < len(window) - 1:
+                token = window[parser.pos]
+                position = (token.line - 1, self.line_tokens[token.line - 1].index(token))
+            else:
+                position = (window_end, 0)
+            window_end = min(window_end + 2 * (window_end - position[0]) + PARSE_WINDOW, len(self.lines))
+
+    def window(self, last, position):
+        """Tokens from `position` up to line index `last`, followed by an EOF token."""
+        line, offset = position
+        tokens = self.line_tokens[line][offset:] if line < last else []
+        for line_tokens in self.line_tokens[line + 1:last]:
+            tokens.extend(line_tokens)
+        tokens.append(self.eof_token(last))
+        return tokens
+
+    def resynchronise(self, window, begin, failed):
+        """
+        Index of the first token from `failed` on that can start a new top-level statement. Never
+        stopping before the token the parser failed on keeps everything the error depends on
+        inside the failed statement.
+        """
+        depth = 0
+        for pos in range(begin, len(window) - 1):
+            token = window[pos]
+            if pos > begin and pos >= failed and depth <= 0 and self.line_tokens[token.line - 1][0] is token:
+                if token.type == TOKENS["Identifier"] or token.value in STATEMENT_KEYWORDS:
+                    return pos
+            if token.type == TOKENS["LeftBrace"]:
+                depth += 1
+            elif token.type == TOKENS["RightBrace"]:
+                depth -= 1
+        return len(window) - 1
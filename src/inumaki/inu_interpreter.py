@@ -5,6 +5,7 @@ from inu_ast import (
     For,
     Function,
     Get,
+    Import,
     Literal,
     Return,
     UnaryOp,
@@ -12,6 +13,8 @@ from inu_ast import (
     While,
     Set,
     CoughSyrup,
+    Stop,
+    Run,
 )
 from inu_exceptions import (
     CursedSpeechOverloadError, 
@@ -22,6 +25,36 @@ from inu_exceptions import (
     InumakiRuntimeError,
     CURSED_SPEECH_THRESHOLD
 )
+from inu_modules import default_modules
+from inu_rope import flatten
+from inu_specialize import miss, observe
+
+# Marks a name missing from the scope, where None would be a valid value
+MISSING = object()
+
+
+def position(token):
+    """Line and column of the token a node came from, for error messages."""
+    if token is None:
+        return None, None
+    return token.line, token.column
+
+
+def callee_name(node):
+    """Readable name of the function a Call calls, for error messages: `f`, `module.f` or `fs[0]`."""
+    match node:
+        case Var(name):
+            return name
+        case Get(obj, Literal(value)) if isinstance(value, str):
+            return f"{callee_name(obj)}.{value}"
+        case Get(obj, Literal(value)):
+            return f"{callee_name(obj)}[{value}]"
+        case Get(obj, Var(name)):
+            return f"{callee_name(obj)}[{name}]"
+        case Get(obj, _):
+            return f"{callee_name(obj)}[...]"
+        case _:
+            return "(...)"
 
 
 class Interpreter:
@@ -30,10 +63,15 @@ class Interpreter:
         def __init__(self, value):
             self.value = value
 
-    def __init__(self, ast, scope, cursed):
+    def __init__(self, ast, scope, cursed, output=None, modules=None):
         self.ast = ast
         self.scope = scope
         self.cursed = cursed
+        self.output = output
+        self.modules = modules  # Modules that Salmon_Roe loads from, default_modules() if None
+        # "Stop" or "Run" while leaving blocks up to the loop that handles it. Kept as state
+        # rather than raised, so leaving a loop early costs no exception.
+        self.signal = None
 
     def run(self):
         for node in self.ast:
@@ -41,14 +79,17 @@ class Interpreter:
             # print(f"Current cursed count: {self.cursed}")  # Debug statement
             if self.cursed > CURSED_SPEECH_THRESHOLD:
                 raise CursedSpeechOverloadError(self.cursed, CURSED_SPEECH_THRESHOLD)
+            if self.signal is not None:
+                break
         return self.scope
 
     def run_block(self, block, scope=None):
         if scope is None:
             scope = self.scope
-        interpreter = Interpreter(block, scope, cursed=self.cursed)
+        interpreter = type(self)(block, scope, cursed=self.cursed, output=self.output, modules=self.modules)
         try:
             self.scope = interpreter.run()
+            self.signal = interpreter.signal
         except self.ReturnException as e:
             raise self.ReturnException(e.value)
         finally:
@@ -60,67 +101,99 @@ class Interpreter:
             case Var(name, cursed):
                 self.cursed += cursed
                 # print(f"Evaluating Var: {name}, cursed: {self.cursed}")  # Debug statement
-                if name not in self.scope:
-                    raise create_undefined_variable_error(name)
-                return self.scope[name]
+                try:
+                    return self.scope[name]
+                except KeyError:
+                    raise create_undefined_variable_error(name, *position(node.token))
             case UnaryOp(op, right):
-                if op == "Not":
-                    return not self.evaluate(right)
-                elif op == "-":
-                    return -self.evaluate(right)
+                if node.fn is None:
+                    raise create_invalid_operator_error(op, *position(node.token))
+                return node.fn(self.evaluate(right))
             case BinaryOp(left, op, right):
+                if node.fn is not None:
+                    # Variables and literals, the usual operands, are read here without going through evaluate()
+                    if type(left) is Var:
+                        self.cursed += left.cursed
+                        try:
+                            left = self.scope[left.name]
+                        except KeyError:
+                            raise create_undefined_variable_error(left.name, *position(left.token))
+                    elif type(left) is Literal:
+                        self.cursed += left.cursed
+                        left = left.value
+                    else:
+                        left = self.evaluate(left)
+                    if type(right) is Var:
+                        self.cursed += right.cursed
+                        try:
+                            right = self.scope[right.name]
+                        except KeyError:
+                            raise create_undefined_variable_error(right.name, *position(right.token))
+                    elif type(right) is Literal:
+                        self.cursed += right.cursed
+                        right = right.value
+                    else:
+                        right = self.evaluate(right)
+                    if node.fast is not None:
+                        try:
+                            value = node.fast(left, right)
+                        except TypeError:
+                            value = NotImplemented  # the left operand has another type
+                        except ZeroDivisionError:
+                            raise create_division_by_zero_error(op.line, op.column)
+                        if value is not NotImplemented:
+                            return value
+                        miss(node)
+                    elif node.warmup:
+                        observe(node, left, right)
+                    try:
+                        return node.fn(left, right)
+                    except ZeroDivisionError:
+                        raise create_division_by_zero_error(op.line, op.column)
+                if node.short_circuit is None:
+                    raise create_invalid_operator_error(op.value, op.line, op.column)
+                # And/Or: the right operand is only evaluated, and charged, when it decides the result
                 left = self.evaluate(left)
-                right = self.evaluate(right)
-                match op.value:
-                    case "+":
-                        return left + right
-                    case "-":
-                        return left - right
-                    case "*":
-                        return left * right
-                    case "/":
-                        if right == 0:
-                            raise create_division_by_zero_error()
-                        return left / right
-                    case "==":
-                        return left == right
-                    case "!=":
-                        return left != right
-                    case ">":
-                        return left > right
-                    case "<":
-                        return left < right
-                    case ">=":
-                        return left >= right
-                    case "<=":
-                        return left <= right
-                    case "%":
-                        return left % right
-                    case "And":
-                        return left and right
-                    case "Or":
-                        return left or right
-                    case _:
-                        raise create_invalid_operator_error(op.value)
+                if bool(left) is node.short_circuit:
+                    return left
+                return self.evaluate(right)
             case Literal(value, cursed):
                 self.cursed += cursed
                 # print(f"Evaluating Literal: {value}, cursed: {self.cursed}")  # Debug statement
                 return value
             case Call(name, args):
                 try:
-                    func = self.evaluate(name)
-                    return func(*[self.evaluate(arg) for arg in args])
+                    if type(name) is Var:
+                        # Look the callee up right here instead of dispatching through evaluate()
+                        self.cursed += name.cursed
+                        func = self.scope.get(name.name, MISSING)
+                        if func is node.builtin:
+                            # Still the builtin the optimizer resolved, so a native function
+                            return func(*[flatten(value) for value in map(self.evaluate, args)])
+                        if func is MISSING:
+                            raise create_undefined_variable_error(name.name, *position(name.token))
+                    else:
+                        func = self.evaluate(name)
+                    values = [*map(self.evaluate, args)]
+                    if getattr(func, "node", None) is None:
+                        # Native functions get plain strings, Inumaki functions keep the Ropes
+                        values = [flatten(value) for value in values]
+                    return func(*values)
                 except Exception as e:
-                    func_name = name.name if hasattr(name, 'name') else str(name)
-                    raise create_function_call_error(func_name, str(e))
+                    raise create_function_call_error(callee_name(name), e, *position(node.token))
             case Get(obj, prop):
                 try:
                     obj = self.evaluate(obj)
                     prop = self.evaluate(prop)
+                    if type(prop) is float and prop.is_integer():
+                        prop = int(prop)  # indices from float literals (legacy number mode)
                     return obj[prop]
                 except (KeyError, IndexError, TypeError) as e:
+                    line, column = position(node.token)
                     raise InumakiRuntimeError(
-                        message=f"Cannot access property/index: {str(e)}",
+                        message=lambda error=e: f"Cannot access property/index: {error}",
+                        line=line,
+                        column=column,
                         suggestion="Check that the object exists and the property/index is valid"
                     )
             case _:
@@ -139,15 +212,23 @@ class Interpreter:
                 self.cursed += cursed
                 # print(f"Executing Function: {name}, cursed: {self.cursed}")  # Debug statement
 
+                # Worked out once per definition rather than on every call
+                names = [param.value for param in params]
+                body_cursed = self.count_cursed_in_body(body)
+
                 def function(*args):
+                    scope = dict(self.scope)
+                    scope.update(zip(names, args))
                     try:
-                        self.run_block(body, {**self.scope, **{param.value: arg for param, arg in zip(params, args)}})
+                        self.run_block(body, scope)
                     except self.ReturnException as e:
                         return e.value
                     finally:
-                        self.cursed += self.count_cursed_in_body(body)
+                        self.cursed += body_cursed
                         # print(f"Cursed count after function call: {self.cursed}")  # Debug statement
 
+                function.node = node
+                function.interpreter = self
                 self.scope[name.value] = function
             case Return(value, cursed):
                 self.cursed += cursed
@@ -158,26 +239,75 @@ class Interpreter:
                 # print(f"Executing Conditional, cursed: {self.cursed}")  # Debug statement
                 if self.evaluate(condition):
                     self.run_block(body)
-                else:
+                elif else_body is not None:
                     self.run_block(else_body)
             case For(variable, condition, increment, body, cursed):
                 self.cursed += cursed
                 # print(f"Executing For, cursed: {self.cursed}")  # Debug statement
                 self.run_block([variable])
+                if node.counted is not None and self.run_counted(node.counted, body):
+                    return
                 while self.evaluate(condition):
                     self.run_block(body)
+                    if self.signal is not None and self.take_signal() == "Stop":
+                        break
                     self.execute(increment)
             case While(condition, body, cursed):
                 self.cursed += cursed
                 # print(f"Executing While, cursed: {self.cursed}")  # Debug statement
                 while self.evaluate(condition):
                     self.run_block(body)
+                    if self.signal is not None and self.take_signal() == "Stop":
+                        break
             case CoughSyrup():
                 self.cursed = 0
                 # print(f"Executing CoughSyrup, cursed reset to: {self.cursed}")  # Debug statement
+            case Stop(cursed):
+                self.cursed += cursed
+                self.signal = "Stop"
+            case Run(cursed):
+                self.cursed += cursed
+                self.signal = "Run"
+            case Import(name, cursed):
+                self.cursed += cursed
+                modules = self.modules if self.modules is not None else default_modules()
+                self.scope[name.value] = modules.load(name.value, name.line, name.column)
             case _:
                 self.evaluate(node)
 
+    def take_signal(self):
+        """Clear the signal a loop body ended with and return it."""
+        signal, self.signal = self.signal, None
+        return signal
+
+    def run_counted(self, loop, body):
+        """
+        Drive a counted Twist loop with a range instead of evaluating the condition and increment
+        nodes. Cursed charges and the final loop variable match the generic loop. Returns False
+        without running anything when the values are not ints, so the caller falls back.
+        """
+        start = self.scope.get(loop.name)
+        if isinstance(loop.bound, Literal):
+            bound = loop.bound.value
+        else:
+            bound = self.scope.get(loop.bound.name)
+        if type(start) is not int or type(bound) is not int:
+            return False
+
+        if loop.inclusive:
+            bound += 1 if loop.step > 0 else -1
+        value = None
+        for value in range(start, bound, loop.step):
+            self.cursed += loop.condition_cursed
+            self.scope[loop.name] = value
+            self.run_block(body)
+            if self.signal is not None and self.take_signal() == "Stop":
+                return True  # the loop variable keeps the value it stopped at
+            self.cursed += loop.increment_cursed
+        self.cursed += loop.condition_cursed  # the check that ends the loop
+        self.scope[loop.name] = start if value is None else value + loop.step
+        return True
+
     def count_cursed_in_body(self, body):
         cursed_count = 0
         for node in body:
@@ -55,6 +55,7 @@ chars = {
     ">": TOKENS["Gt"],
     ">=": TOKENS["Gte"],
     "==": TOKENS["Equiv"],
+    "!=": TOKENS["NotEquiv"],
     ";": TOKENS["Semicolon"],
 }
 
@@ -67,6 +68,9 @@ KEYWORDS = [
     "Twist",  # for loop
     "Plummet",  # while loop
     "Cough_Syrup",
+    "Stop",  # leave a loop
+    "Run",  # next loop iteration
+    "Salmon_Roe",  # import a module
 ]
 
 CURSED_WORDS = [
@@ -97,8 +101,9 @@ class Token:
 
 
 class Lexer:
-    def __init__(self, text):
+    def __init__(self, text, float_numbers=False):
         self.text = text
+        self.float_numbers = float_numbers  # legacy behaviour: every number literal is a float
         self.tokens = []
         self.current = 0
         self.line = 1
@@ -174,15 +179,25 @@ class Lexer:
                     self.tokens.append(Token(TOKENS["Equiv"], "==", "==", self.line, self.column))
                 else:
                     raise create_invalid_character_error("=", self.line, self.column)
+            case "!":
+                if self.match("="):
+                    self.tokens.append(Token(TOKENS["NotEquiv"], "!=", "!=", self.line, self.column))
+                else:
+                    raise create_invalid_character_error("!", self.line, self.column)
             case "'" | '"':
+                line, column = self.line, self.column
                 string = ""
                 while self.peek() != char:
-                    string += self.advance()
                     if not self.peek():
                         raise create_unterminated_string_error(self.line, self.column)
+                    string += self.advance()
+                    if string[-1] == "\n":
+                        self.line += 1
+                        self.column = 0
 
                 self.advance()  # closing quote
-                self.tokens.append(Token(TOKENS["String"], string, string, self.line, self.column))
+                # Strings may span lines, they are reported at the line they start on
+                self.tokens.append(Token(TOKENS["String"], string, string, line, column))
             case " " | "\t" | "\r":
                 pass
             case "\n":
@@ -194,7 +209,11 @@ class Lexer:
                     while self.peek() and (self.peek().isdigit() or (self.peek() == "." and self.peekn(1).isdigit())):
                         number += self.advance()
 
-                    self.tokens.append(Token(TOKENS["Number"], number, float(number), self.line, self.column))
+                    if self.float_numbers or "." in number:
+                        value = float(number)
+                    else:
+                        value = int(number)
+                    self.tokens.append(Token(TOKENS["Number"], number, value, self.line, self.column))
                 elif char.isalpha() or char == "_":  # Gather the whole word
                     self.start_word(char)
                 else:
@@ -0,0 +1,206 @@
+"""
+Modules.
+
+`Salmon_Roe name` binds the module called `name`. Native modules are Python modules listed in
+inu_stdlib.native_modules and are only imported once a program asks for them. Any other name
+is looked up as `name.inu` in the directories of the search path: the script's directory,
+then those in INUMAKI_PATH.
+
+A module runs once, in an interpreter and scope of its own, the first time it is imported;
+every later import gets the same Module. Compiled trees are kept for the rest of the process
+and pickled to a __inucache__ directory next to the source, so the next process skips lexing
+and parsing for as long as the file keeps its size and modification time.
+
+Loading a cache file unpickles it, which can run arbitrary code, so a cache is only trusted as
+much as the person who could have written it. A cache file is read only when it is a regular
+file (not a symlink) owned by the user running the interpreter and not writable by its group
+or by others; anything else is ignored and the module is compiled from source. Cache files
+are written readable by everyone but writable only by their owner. This keeps other local
+users out; whoever can already write files as you can also edit the `.inu` source itself.
+"""
+
+import importlib
+import os
+import pickle
+from stat import S_ISREG, S_IWGRP, S_IWOTH
+
+from inu_exceptions import InumakiException, SourceIndex, create_module_not_found_error
+from inu_lexer import Lexer
+from inu_optimizer import optimize
+from inu_parser import Parser
+
+# Bump whenever the layout of the tree changes, so older pickles are not loaded
+CACHE_VERSION = 2
+CACHE_DIRECTORY = "__inucache__"
+
+_compiled = {}  # (path, float_numbers) -> (stamp, tree)
+_default = None
+
+
+def compile_source(text, float_numbers=False):
+    """Lex, parse and optimize `text`, returning the tree the Interpreter runs."""
+    lexer = Lexer(text, float_numbers=float_numbers)
+    lexer.scan_tokens()
+
+    parser = Parser(lexer.tokens)
+    parser.parse()
+    return optimize(parser.ast)
+
+
+def cache_path(path, float_numbers=False):
+    directory, filename = os.path.split(path)
+    stem = os.path.splitext(filename)[0]
+    flavour = ".float" if float_numbers else ""
+    return os.path.join(directory, CACHE_DIRECTORY, f"{stem}.v{CACHE_VERSION}{flavour}.pickle")
+
+
+def trusted(file):
+    """Whether an open cache file is a regular file that only the current user could have written."""
+    info = os.fstat(file.fileno())
+    if not S_ISREG(info.st_mode) or info.st_mode & (S_IWGRP | S_IWOTH):
+        return False
+    return not hasattr(os, "getuid") or info.st_uid == os.getuid()
+
+
+def read_cache(cache, stamp):
+    """
+    The tree pickled at `cache` if it was compiled from a file with this stamp, otherwise None.
+    Files that someone else could have written are never unpickled.
+    """
+    try:
+        descriptor = os.open(cache, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+        with open(descriptor, "rb") as file:
+            if not trusted(file) or pickle.load(file) != stamp:
+                return None
+            return pickle.load(file)
+    except Exception:
+        return None  # missing, a symlink, unreadable or written by an incompatible version
+
+
+def write_cache(cache, stamp, tree):
+    temporary = f"{cache}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        with open(descriptor, "wb") as file:
+            os.chmod(temporary, 0o644)  # whatever the umask, or read_cache would not trust it
+            pickle.dump(stamp, file)
+            pickle.dump(tree, file)
+        os.replace(temporary, cache)  # readers never see a half written file
+    except Exception:
+        # A read-only directory or a tree too deep to pickle only costs the next process a compile
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+
+
+def load_tree(path, float_numbers=False):
+    """The compiled tree of the file at `path`, from memory, from the disk cache or by compiling it."""
+    stat = os.stat(path)
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    key = (path, float_numbers)
+    entry = _compiled.get(key)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+
+    cache = cache_path(path, float_numbers)
+    tree = read_cache(cache, stamp)
+    if tree is None:
+        with open(path, "r") as file:
+            text = file.read()
+        try:
+            tree = compile_source(text, float_numbers=float_numbers)
+        except InumakiException as e:
+            e.source = SourceIndex(text)
+            raise
+        write_cache(cache, stamp, tree)
+    _compiled[key] = (stamp, tree)
+    return tree
+
+
+class Module:
+    """An imported module, `module.name` reads a name bound at its top level."""
+
+    def __init__(self, name, scope):
+        self.name = name
+        self.scope = scope
+
+    def __getitem__(self, name):
+        return self.scope[name]
+
+    def __repr__(self):
+        return f"<module {self.name}>"
+
+
+class Modules:
+    """
+    The modules loaded by one program, shared by every importer. `.inu` files are searched for
+    in `path` and then in the directories listed in INUMAKI_PATH.
+    """
+
+    def __init__(self, path=(), output=None, float_numbers=False):
+        extra = os.environ.get("INUMAKI_PATH", "").split(os.pathsep)
+        self.path = [os.path.abspath(directory) for directory in [*path, *extra] if directory]
+        self.output = output
+        self.float_numbers = float_numbers
+        self.loaded = {}  # native module name or absolute path -> Module
+
+    def find(self, name):
+        for directory in self.path:
+            path = os.path.join(directory, f"{name}.inu")
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def load(self, name, line=None, column=None):
+        from inu_stdlib import native_modules
+
+        module = self.loaded.get(name)
+        if module is not None:
+            return module
+        if name in native_modules:
+            module = self.loaded[name] = Module(name, importlib.import_module(native_modules[name]).exports)
+            return module
+
+        path = self.find(name)
+        if path is None:
+            raise create_module_not_found_error(name, self.path, line, column)
+        module = self.loaded.get(path)
+        if module is None:
+            # Registered before it runs, so an import cycle gets the partly run module
+            module = self.loaded[path] = Module(name, self.create_scope())
+            try:
+                self.run(module, path)
+            except BaseException:
+                del self.loaded[path]
+                raise
+        return module
+
+    def create_scope(self):
+        from inu_stdlib import create_scope, inu_stdlib
+
+        if self.output is None:
+            return dict(inu_stdlib)
+        return create_scope(self.output)
+
+    def run(self, module, path):
+        from inu_interpreter import Interpreter
+
+        tree = load_tree(path, self.float_numbers)
+        interpreter = Interpreter(tree, scope=module.scope, cursed=0, output=self.output, modules=self)
+        try:
+            module.scope = interpreter.run()
+        except InumakiException as e:
+            if e.source is None:
+                with open(path, "r") as file:
+                    e.source = SourceIndex(file.read())
+            raise
+
+
+def default_modules():
+    """Modules of programs run without a Modules of their own, searched for in the working directory."""
+    global _default
+    if _default is None:
+        _default = Modules(["."])
+    return _default
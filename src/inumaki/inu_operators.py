@@ -0,0 +1,45 @@
+"""
+Operator tables shared by the tree and the interpreter.
+
+BinaryOp and UnaryOp nodes look their operator up here once when they are built, so evaluating
+them calls a function directly instead of matching on the operator text every time.
+"""
+
+import operator
+
+from inu_rope import Rope
+
+
+def add(left, right):
+    """`+`, building a Rope when the left operand is a string so concatenation in loops stays linear."""
+    if type(left) is str:
+        return Rope.concat(left, right)
+    return left + right
+
+
+BINARY_OPERATORS = {
+    "+": add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,  # the interpreter turns ZeroDivisionError into an Inumaki error
+    "%": operator.mod,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+# Operators that skip their right operand, mapped to the truth value of the left operand that
+# decides the result on its own
+SHORT_CIRCUIT = {
+    "And": False,
+    "Or": True,
+}
+
+UNARY_OPERATORS = {
+    "-": operator.neg,
+    "!": operator.not_,
+    "Not": operator.not_,
+}
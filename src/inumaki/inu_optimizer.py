@@ -0,0 +1,172 @@
+"""
+Tree rewrites applied between parsing and interpretation.
+
+The optimizer only annotates nodes with extra information that the interpreter can use to
+take a faster path. An unoptimized tree runs exactly the same way, just slower.
+"""
+
+from inu_ast import (
+    BinaryOp,
+    Call,
+    Conditional,
+    For,
+    Function,
+    Get,
+    Import,
+    Literal,
+    Return,
+    Set,
+    UnaryOp,
+    Var,
+    While,
+)
+
+# Condition operator -> (direction of the increment, whether the bound itself is included)
+COUNTED_CONDITIONS = {
+    "<": ("+", False),
+    "<=": ("+", True),
+    ">": ("-", False),
+    ">=": ("-", True),
+}
+
+
+class CountedLoop:
+    """A Twist loop of the shape `Tuna i Tuna a ... i < N ... Tuna i Tuna i + k`."""
+
+    def __init__(self, name, bound, step, inclusive, condition_cursed, increment_cursed):
+        self.name = name
+        self.bound = bound  # Literal or Var node
+        self.step = step  # signed
+        self.inclusive = inclusive
+        self.condition_cursed = condition_cursed
+        self.increment_cursed = increment_cursed
+
+
+def optimize(ast):
+    """Annotate every node of a program's tree in place and return it."""
+    optimize_block(ast)
+    resolve_builtins(ast)
+    return ast
+
+
+def optimize_block(body):
+    for node in body:
+        optimize_node(node)
+
+
+def optimize_node(node):
+    match node:
+        case For(_, _, _, body):
+            node.counted = match_counted_loop(node)
+            optimize_block(body)
+        case Function(_, _, body) | While(_, body):
+            optimize_block(body)
+        case Conditional(_, body, else_body):
+            optimize_block(body)
+            if else_body:
+                optimize_block(else_body)
+
+
+def resolve_builtins(ast):
+    """
+    Point calls of a builtin that the program never binds a name over (with Tuna, Tuna_Mayo,
+    a parameter or Salmon_Roe) at the builtin itself. The scope the program runs in may still
+    bind the name to something else, such as a REPL line before it or an embedder's own
+    function, so the interpreter only takes the shortcut while the scope holds that builtin.
+    """
+    from inu_stdlib import CONSTANT_BUILTINS, inu_stdlib
+
+    bound = assigned_names(ast)
+    calls = []
+    for node in walk(ast):
+        match node:
+            case Function(_, params):
+                bound.update(param.value for param in params)
+            case Call(Var(name)) if name in CONSTANT_BUILTINS:
+                calls.append(node)
+    for node in calls:
+        if node.name.name not in bound:
+            node.builtin = inu_stdlib[node.name.name]
+
+
+def walk(nodes):
+    """Every node of a block, its expressions and the blocks nested in it."""
+    for node in nodes:
+        if node is None:
+            continue
+        yield node
+        match node:
+            case Set(_, value) | Return(value) | UnaryOp(_, value):
+                yield from walk([value])
+            case BinaryOp(left, _, right) | Get(left, right):
+                yield from walk([left, right])
+            case Call(name, args):
+                yield from walk([name, *args])
+            case Function(_, _, body):
+                yield from walk(body)
+            case Conditional(condition, body, else_body):
+                yield from walk([condition, *body, *(else_body or [])])
+            case For(variable, condition, increment, body):
+                yield from walk([variable, condition, increment, *body])
+            case While(condition, body):
+                yield from walk([condition, *body])
+
+
+def match_counted_loop(node):
+    """Return a CountedLoop for `node` if it can be driven by a range, otherwise None."""
+    variable, condition, increment, body = node.variable, node.condition, node.increment, node.body
+    name = variable.name.value
+
+    match condition:
+        case BinaryOp(Var(var_name, var_cursed), op, Literal() | Var() as bound):
+            if var_name != name or op.value not in COUNTED_CONDITIONS:
+                return None
+            if isinstance(bound, Literal) and type(bound.value) is not int:
+                return None
+            direction, inclusive = COUNTED_CONDITIONS[op.value]
+        case _:
+            return None
+
+    match increment:
+        case Set(target, BinaryOp(Var(inc_name, inc_var_cursed), inc_op, Literal(step, step_cursed)), set_cursed):
+            if target.value != name or inc_name != name or inc_op.value != direction:
+                return None
+            if type(step) is not int or step <= 0:
+                return None
+        case _:
+            return None
+
+    assigned = assigned_names(body)
+    if name in assigned or (isinstance(bound, Var) and (bound.name == name or bound.name in assigned)):
+        return None
+
+    return CountedLoop(
+        name=name,
+        bound=bound,
+        step=step if direction == "+" else -step,
+        inclusive=inclusive,
+        condition_cursed=var_cursed + bound.cursed,
+        increment_cursed=set_cursed + inc_var_cursed + step_cursed,
+    )
+
+
+def assigned_names(body, names=None):
+    """Collect every name a block can bind, including nested blocks and function bodies."""
+    if names is None:
+        names = set()
+    for node in body or []:
+        match node:
+            case Set(name) | Import(name):
+                names.add(name.value)
+            case Function(name, _, function_body):
+                names.add(name.value)
+                assigned_names(function_body, names)
+            case For(variable, _, increment, loop_body):
+                assigned_names([variable, increment], names)
+                assigned_names(loop_body, names)
+            case While(_, loop_body):
+                assigned_names(loop_body, names)
+            case Conditional(_, if_body, else_body):
+                assigned_names(if_body, names)
+                assigned_names(else_body, names)
+    return names
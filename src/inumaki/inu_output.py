@@ -0,0 +1,102 @@
+"""
+Buffered output for Inumaki programs.
+
+`Tuna_Tuna` writes through an Output instead of calling print directly, so a run can decide
+how often output is flushed and where it ends up: a stream (stdout by default), a file, an
+in-memory buffer or a callback.
+"""
+
+import io
+import sys
+
+FLUSH_POLICIES = ("size", "line", "explicit")
+DEFAULT_BUFFER_SIZE = 8192
+
+
+class Output:
+    """
+    Collects written text and hands it to the target according to the flush policy:
+
+    - "size": flush once the buffer holds at least `buffer_size` characters
+    - "line": flush after every write that ends a line
+    - "explicit": only flush when flush() or close() is called
+    """
+
+    def __init__(self, target=None, policy="size", buffer_size=DEFAULT_BUFFER_SIZE):
+        if policy not in FLUSH_POLICIES:
+            raise ValueError(f"Unknown flush policy '{policy}', expected one of {', '.join(FLUSH_POLICIES)}")
+
+        self.policy = policy
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.buffered = 0
+        self.owns_target = False
+        self.closed = False
+        self.stream = None
+        self.callback = None
+
+        if target is None:
+            self.stream = sys.stdout
+        elif isinstance(target, str):
+            self.stream = open(target, "w")
+            self.owns_target = True
+        elif hasattr(target, "write"):
+            self.stream = target
+        elif callable(target):
+            self.callback = target
+        else:
+            raise TypeError(f"Cannot write output to {type(target).__name__}")
+
+    @classmethod
+    def memory(cls, policy="explicit"):
+        """Output collected in an in-memory buffer, read back with getvalue()."""
+        return cls(io.StringIO(), policy=policy)
+
+    def print(self, *values, sep=" ", end="\n"):
+        self.write(sep.join(str(value) for value in values) + end)
+
+    def write(self, text):
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.policy == "line":
+            if "\n" in text:
+                self.flush()
+        elif self.policy == "size" and self.buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            text = "".join(self.buffer)
+            self.buffer = []
+            self.buffered = 0
+            if self.callback is not None:
+                self.callback(text)
+            else:
+                self.stream.write(text)
+        if self.stream is not None:
+            self.stream.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+        if self.owns_target:
+            self.stream.close()
+
+    def getvalue(self):
+        self.flush()
+        return self.stream.getvalue()
+
+    def take(self):
+        """Like getvalue() but also empties the in-memory buffer, for output collected piece by piece."""
+        value = self.getvalue()
+        self.stream.seek(0)
+        self.stream.truncate()
+        return value
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
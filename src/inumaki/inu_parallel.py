@@ -0,0 +1,302 @@
+"""
+Parallel builtins.
+
+`Parallel_Map(f, items)` calls an Inumaki function on every element of `items` (a number n
+stands for 0 .. n-1) and returns the results as a list. `Parallel_Reduce(f, combine, items,
+initial)` does the same and then folds the results into `initial` with `combine`, in order.
+
+Closures cannot be pickled, so a function is sent to the worker processes as its Function
+node together with the values of the names its body uses; functions among those values are
+sent the same way. A worker rebuilds the closures and runs its share of the calls, starting
+the cursed counter of every defining interpreter at its own large offset. Reading the offset
+back off the counter at every checkpoint tells which counter the value came from, so the
+parent can replay each call in order: output is written, cursed speech is charged to the
+interpreters that defined the functions and the threshold is checked, exactly as sequential
+calls would.
+
+A call the worker cannot reproduce faithfully is run again in the parent, and so is every
+call after it: one that overloads or raises, one that ends without Return (the interpreter
+then keeps the scope of the call), or one whose result cannot be pickled. Functions that can
+reach a list, dict or module, or items that are not plain numbers and strings, are never sent
+at all: a worker would change its own copy instead of the value the parent sees.
+"""
+
+import os
+import pickle
+
+from inu_ast import Var
+from inu_exceptions import CURSED_SPEECH_THRESHOLD, CursedSpeechOverloadError
+from inu_interpreter import Interpreter
+from inu_output import Output
+from inu_rope import Rope
+
+WORKERS = os.cpu_count() or 1
+
+# Pieces each worker gets on average, more pieces balance uneven calls better
+CHUNKS_PER_WORKER = 4
+
+# Distance between the starting offsets of the cursed counters in a worker
+SPAN = 10**12
+
+# Values sent to the workers as copies, only immutable ones so no call can tell the difference
+SHIPPABLE = {int, float, bool, str, Rope, type(None)}
+
+_pool = None
+_in_worker = False
+
+
+class NotShippable(Exception):
+    """A value the function depends on cannot be sent to another process."""
+
+
+class FunctionRef:
+    def __init__(self, index):
+        self.index = index
+
+
+class BuiltinRef:
+    def __init__(self, name):
+        self.name = name
+
+
+def used_names(node, names):
+    """Add every name read anywhere below `node` to `names`."""
+    if isinstance(node, Var):
+        names.add(node.name)
+    elif isinstance(node, list):
+        for child in node:
+            used_names(child, names)
+    elif hasattr(node, "__match_args__"):
+        for child in vars(node).values():
+            used_names(child, names)
+    return names
+
+
+class Shipment:
+    """A function and everything it reaches, in a form that can be pickled."""
+
+    def __init__(self, function):
+        from inu_stdlib import inu_stdlib
+
+        self.stdlib = inu_stdlib
+        self.functions = []  # (Function node, definer index, {name: value}) for every function
+        self.definers = []  # Interpreters that defined the functions, in the parent
+        self.indices = {}  # id(closure) -> index in self.functions
+        self.sink = None  # Tuna_Tuna the functions print through
+        self.add(function)
+
+    def add(self, function):
+        index = self.indices.get(id(function))
+        if index is not None:
+            return index
+
+        definer = function.interpreter
+        for lineage, other in enumerate(self.definers):
+            if other is definer:
+                break
+        else:
+            lineage = len(self.definers)
+            self.definers.append(definer)
+
+        values = {}
+        index = len(self.functions)
+        self.indices[id(function)] = index
+        self.functions.append((function.node, lineage, values))
+        for name in sorted(used_names(function.node.body, set())):
+            if name in definer.scope:
+                values[name] = self.value(name, definer.scope[name])
+        return index
+
+    def value(self, name, value):
+        if getattr(value, "node", None) is not None:
+            return FunctionRef(self.add(value))
+        if name == "Tuna_Tuna" and (value is print or isinstance(getattr(value, "__self__", None), Output)):
+            if self.sink is not None and self.sink != value:
+                raise NotShippable(name)
+            self.sink = value
+            return BuiltinRef(name)
+        if name in self.stdlib and value is self.stdlib[name]:
+            return BuiltinRef(name)
+        if type(value) not in SHIPPABLE:
+            # Functions, and lists, dicts or modules a call could change: a worker would only change its copy
+            raise NotShippable(name)
+        return value
+
+    def payload(self):
+        return pickle.dumps((self.functions, len(self.definers)))
+
+
+class Trace:
+    """Highest cursed counts seen at the checkpoints of one call in a worker."""
+
+    def __init__(self):
+        self.relative = {}  # definer index -> highest count above that definer's starting value
+        self.absolute = 0  # highest count after a Cough_Syrup
+
+    def checkpoint(self, cursed):
+        lineage, count = divmod(cursed, SPAN)
+        if lineage:
+            if count > self.relative.get(lineage - 1, -1):
+                self.relative[lineage - 1] = count
+        elif count > self.absolute:
+            self.absolute = count
+        if count > CURSED_SPEECH_THRESHOLD:
+            # Overloads whatever the starting value, the parent runs the call itself
+            raise CursedSpeechOverloadError(count, CURSED_SPEECH_THRESHOLD)
+
+
+class WorkerInterpreter(Interpreter):
+    """Interpreter recording the cursed counter at every checkpoint instead of only checking it."""
+
+    trace = None
+
+    def run(self):
+        for node in self.ast:
+            self.execute(node)
+            self.trace.checkpoint(self.cursed)
+            if self.signal is not None:
+                break
+        return self.scope
+
+
+class Outcome:
+    def __init__(self, value, text, counters, trace):
+        self.value = value
+        self.text = text
+        self.counters = counters  # per definer: (True, count added) or (False, count reset to)
+        self.relative = trace.relative
+
+
+def start_worker():
+    global _in_worker
+    _in_worker = True
+
+
+def run_chunk(payload, items):
+    """
+    Run the first shipped function on `items` in a worker. Returns the Outcome of every call up
+    to the first one the parent has to run itself.
+    """
+    from inu_stdlib import create_scope
+
+    functions, definer_count = pickle.loads(payload)
+    pieces = []
+    output = Output(pieces.append, policy="explicit")
+    builtins = create_scope(output)
+    definers = [WorkerInterpreter([], {}, 0, output) for _ in range(definer_count)]
+
+    closures = []
+    for node, lineage, _ in functions:
+        definers[lineage].execute(node)
+        closures.append(definers[lineage].scope[node.name.value])
+    for _, lineage, values in functions:
+        scope = definers[lineage].scope
+        for name, value in values.items():
+            if isinstance(value, FunctionRef):
+                value = closures[value.index]
+            elif isinstance(value, BuiltinRef):
+                value = builtins[value.name]
+            scope[name] = value
+
+    scopes = [definer.scope for definer in definers]
+    outcomes = []
+    for item in items:
+        for lineage, definer in enumerate(definers):
+            definer.cursed = (lineage + 1) * SPAN
+        trace = WorkerInterpreter.trace = Trace()
+        try:
+            value = closures[0](item)
+            pickle.dumps(value)
+        except Exception:
+            break
+        if any(definer.scope is not scope for definer, scope in zip(definers, scopes)):
+            break  # ended without Return, the next call would see this call's scope
+
+        counters = []
+        for lineage, definer in enumerate(definers):
+            offset, count = divmod(definer.cursed, SPAN)
+            counters.append((True, count) if offset == lineage + 1 else (False, definer.cursed))
+        output.flush()
+        outcomes.append(Outcome(value, "".join(pieces), counters, trace))
+        pieces.clear()
+    return outcomes
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        # Imported here, most programs never start a pool and should not pay for the import
+        from concurrent.futures import ProcessPoolExecutor
+
+        _pool = ProcessPoolExecutor(max_workers=WORKERS, initializer=start_worker)
+    return _pool
+
+
+def run_parallel(function, items):
+    """Outcomes of calling `function` on `items` in the workers, in order, or None if it cannot be shipped."""
+    if any(type(item) not in SHIPPABLE for item in items):
+        return None, None
+    try:
+        shipment = Shipment(function)
+        payload = shipment.payload()
+    except (NotShippable, pickle.PicklingError, TypeError, AttributeError):
+        return None, None
+
+    size = -(-len(items) // (WORKERS * CHUNKS_PER_WORKER))
+    chunks = [items[start:start + size] for start in range(0, len(items), size)]
+    try:
+        futures = [get_pool().submit(run_chunk, payload, chunk) for chunk in chunks]
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None, None
+
+    outcomes = []
+    for chunk, future in zip(chunks, futures):
+        try:
+            done = future.result()
+        except Exception:
+            break  # a worker died, the parent runs the remaining calls
+        outcomes.extend(done)
+        if len(done) < len(chunk):
+            break  # the parent takes over from here
+    for future in futures:
+        future.cancel()
+    return shipment, outcomes
+
+
+def replay(shipment, outcome):
+    """Apply a worker call to the parent. Returns False, changing nothing, if the call would overload here."""
+    definers = shipment.definers
+    for lineage, peak in outcome.relative.items():
+        if definers[lineage].cursed + peak > CURSED_SPEECH_THRESHOLD:
+            return False
+
+    if outcome.text:
+        shipment.sink(outcome.text, end="")
+    for definer, (added, count) in zip(definers, outcome.counters):
+        definer.cursed = definer.cursed + count if added else count
+    return True
+
+
+def parallel_map(function, items):
+    """Parallel_Map(f, items): [f(x) for x in items], with a number n standing for 0 .. n-1."""
+    items = list(range(items)) if type(items) is int else list(items)
+    results = []
+    if WORKERS > 1 and len(items) > 1 and not _in_worker and getattr(function, "node", None) is not None:
+        shipment, outcomes = run_parallel(function, items)
+        if outcomes is not None:
+            for outcome in outcomes:
+                if not replay(shipment, outcome):
+                    break
+                results.append(outcome.value)
+
+    for item in items[len(results):]:
+        results.append(function(item))
+    return results
+
+
+def parallel_reduce(function, combine, items, initial):
+    """Parallel_Reduce(f, combine, items, initial): fold combine over Parallel_Map(f, items), starting at initial."""
+    value = initial
+    for result in parallel_map(function, items):
+        value = combine(value, result)
+    return value
@@ -5,6 +5,7 @@ from inu_ast import (
     For,
     Function,
     Get,
+    Import,
     Literal,
     Return,
     UnaryOp,
@@ -12,9 +13,11 @@ from inu_ast import (
     While,
     Set,
     CoughSyrup,
+    Stop,
+    Run,
 )
 from inu_lexer import KEYWORDS, TOKENS, Token
-from inu_exceptions import create_unexpected_token_error
+from inu_exceptions import create_outside_loop_error, create_unexpected_token_error
 
 
 class Parser:
@@ -22,6 +25,7 @@ class Parser:
         self.tokens = tokens
         self.pos = 0
         self.ast = []
+        self.loop_depth = 0  # loops around the statement being parsed, within its function
 
     def peek(self):
         if self.pos >= len(self.tokens):
@@ -57,37 +61,43 @@ class Parser:
     def term(self):
         if self.peek().type == TOKENS["Identifier"]:
             var = self.eat("Identifier")
-            name = Var(var.value, var.cursed)
-            while self.peek().type in [TOKENS["Dot"], TOKENS["LeftParen"]]:
+            name = Var(var.value, var.cursed, token=var)
+            while self.peek().type in [TOKENS["Dot"], TOKENS["LeftBracket"], TOKENS["LeftParen"]]:
                 if self.peek().type == TOKENS["Dot"]:
-                    self.eat("Dot")
-                    name = Get(name, self.eat("Identifier"))
+                    dot = self.eat("Dot")
+                    prop = self.eat("Identifier")
+                    name = Get(name, Literal(prop.value, prop.cursed, token=prop), token=dot)
+                elif self.peek().type == TOKENS["LeftBracket"]:
+                    bracket = self.eat("LeftBracket")
+                    index = self.expression()
+                    self.eat("RightBracket")
+                    name = Get(name, index, token=bracket)
                 else:
-                    self.eat("LeftParen")
+                    paren = self.eat("LeftParen")
                     args = []
                     while self.peek().type != TOKENS["RightParen"]:
                         args.append(self.expression())
                         if self.peek().type == TOKENS["Comma"]:
                             self.eat("Comma")
                     self.eat("RightParen")
-                    name = Call(name, args)
+                    name = Call(name, args, token=paren)
 
             return name
 
         elif self.peek().type in [TOKENS["Number"], TOKENS["Boolean"], TOKENS["String"]]:
             literal = self.eat(self.peek().type)
-            return Literal(literal.content, literal.cursed)
+            return Literal(literal.content, literal.cursed, token=literal)
         elif self.peek().type == TOKENS["LeftParen"]:
             self.eat("LeftParen")
             expr = self.expression()
             self.eat("RightParen")
             return expr
         elif self.peek().type == TOKENS["Minus"]:
-            self.eat("Minus")
-            return UnaryOp("-", self.term())
+            minus = self.eat("Minus")
+            return UnaryOp("-", self.term(), token=minus)
         elif self.peek().type == TOKENS["Not"]:
-            self.eat("Not")
-            return UnaryOp("!", self.term())
+            not_token = self.eat("Not")
+            return UnaryOp("!", self.term(), token=not_token)
         else:
             current_token = self.peek()
             raise create_unexpected_token_error("expression", current_token.type, current_token.line, current_token.column)
@@ -140,6 +150,10 @@ class Parser:
                     return self.while_stmt()
                 case "Cough_Syrup":
                     return self.cough_syrup()
+                case "Stop" | "Run":
+                    return self.loop_control_stmt()
+                case "Salmon_Roe":
+                    return self.import_stmt()
                 case _:
                     raise create_unexpected_token_error("valid keyword", next.value, next.line, next.column)
         else:
@@ -169,8 +183,12 @@ class Parser:
 
         self.eat("LeftBrace")
         body = []
-        while self.peek().type != TOKENS["RightBrace"]:
-            body.append(self.parse_statement())
+        loop_depth, self.loop_depth = self.loop_depth, 0  # Stop cannot leave a loop around the function
+        try:
+            while self.peek().type != TOKENS["RightBrace"]:
+                body.append(self.parse_statement())
+        finally:
+            self.loop_depth = loop_depth
         self.eat("RightBrace")
 
         return Function(name, params, body, cursed)
@@ -221,11 +239,7 @@ class Parser:
         increment = self.parse_statement()
         cursed += self.eat_keyword().cursed
 
-        self.eat("LeftBrace")
-        body = []
-        while self.peek().type != TOKENS["RightBrace"]:
-            body.append(self.parse_statement())
-        self.eat("RightBrace")
+        body = self.loop_body()
 
         return For(var, condition, increment, body, cursed)
 
@@ -235,14 +249,35 @@ class Parser:
         cursed += self.eat_keyword().cursed
         condition = self.expression()
         cursed += self.eat_keyword().cursed
+        body = self.loop_body()
+
+        return While(condition, body, cursed)
+
+    def loop_body(self):
         self.eat("LeftBrace")
         body = []
-        while self.peek().type != TOKENS["RightBrace"]:
-            body.append(self.parse_statement())
+        self.loop_depth += 1
+        try:
+            while self.peek().type != TOKENS["RightBrace"]:
+                body.append(self.parse_statement())
+        finally:
+            self.loop_depth -= 1
         self.eat("RightBrace")
-
-        return While(condition, body, cursed)
+        return body
 
     def cough_syrup(self):
         self.eat("Cough_Syrup")
         return CoughSyrup()
+
+    def loop_control_stmt(self):
+        keyword = self.eat_keyword()
+        if self.loop_depth == 0:
+            raise create_outside_loop_error(keyword.value, keyword.line, keyword.column)
+        if keyword.value == "Stop":
+            return Stop(keyword.cursed, token=keyword)
+        return Run(keyword.cursed, token=keyword)
+
+    def import_stmt(self):
+        keyword = self.eat("Salmon_Roe")
+        name = self.eat("Identifier")
+        return Import(name, keyword.cursed + name.cursed, token=keyword)
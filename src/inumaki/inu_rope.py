@@ -0,0 +1,105 @@
+"""
+Rope strings.
+
+`s + x` on a Python str copies all of `s`, so building a string in a loop is quadratic. When
+the left operand of `+` is a string the interpreter produces a Rope instead, which only
+remembers the pieces. Appending to the newest Rope of a chain adds to a list shared along
+the chain; appending to an older one copies its pieces first, so every Rope keeps the value it
+had. The pieces are joined into a str the first time the value is printed, compared, indexed
+or passed to a native function.
+"""
+
+
+class Rope:
+    __slots__ = ("parts", "count", "length", "flat")
+
+    def __init__(self, parts, count, length):
+        self.parts = parts  # list shared with the other Ropes of the chain
+        self.count = count  # number of leading parts that make up this Rope
+        self.length = length
+        self.flat = None
+
+    @classmethod
+    def concat(cls, left, right):
+        """`left + right` for a str `left`."""
+        if type(right) is Rope:
+            right = right.flatten()
+        elif type(right) is not str:
+            return left + right  # raises the usual TypeError
+        return cls([left, right], 2, len(left) + len(right))
+
+    def flatten(self):
+        if self.flat is None:
+            parts = self.parts if self.count == len(self.parts) else self.parts[:self.count]
+            self.flat = "".join(parts)
+        return self.flat
+
+    def __add__(self, other):
+        if type(other) is Rope:
+            other = other.flatten()
+        elif type(other) is not str:
+            return self.flatten() + other  # raises the usual TypeError
+        parts = self.parts
+        if self.count != len(parts):
+            parts = parts[:self.count]  # a later Rope already appended to the shared list
+        parts.append(other)
+        return Rope(parts, self.count + 1, self.length + len(other))
+
+    def __radd__(self, other):
+        if type(other) is not str:
+            return NotImplemented
+        return Rope([other, self.flatten()], 2, len(other) + self.length)
+
+    def __str__(self):
+        return self.flatten()
+
+    def __repr__(self):
+        return repr(self.flatten())
+
+    def __len__(self):
+        return self.length
+
+    def __bool__(self):
+        return self.length > 0
+
+    def __getitem__(self, index):
+        return self.flatten()[index]
+
+    def __mul__(self, other):
+        return self.flatten() * other
+
+    __rmul__ = __mul__
+
+    def __mod__(self, other):
+        return self.flatten() % other
+
+    def __hash__(self):
+        return hash(self.flatten())
+
+    def __eq__(self, other):
+        return self.flatten() == flatten(other)
+
+    def __ne__(self, other):
+        return self.flatten() != flatten(other)
+
+    def __lt__(self, other):
+        return self.flatten() < flatten(other)
+
+    def __le__(self, other):
+        return self.flatten() <= flatten(other)
+
+    def __gt__(self, other):
+        return self.flatten() > flatten(other)
+
+    def __ge__(self, other):
+        return self.flatten() >= flatten(other)
+
+    def __reduce__(self):
+        return str, (self.flatten(),)
+
+
+def flatten(value):
+    """`value` as a plain str if it is a Rope, otherwise unchanged."""
+    if type(value) is Rope:
+        return value.flatten()
+    return value
@@ -0,0 +1,261 @@
+"""
+Long running Inumaki server.
+
+`inumaki serve` keeps the interpreter imported and warm so a script only pays for its own
+execution. Requests and responses are JSON objects, one per line:
+
+    request:  {"id": 1, "source": "Tuna_Tuna(1)"}  or  {"id": 1, "path": "/abs/script.inu"}
+              optional: "float_numbers": true, "cwd": "/abs/dir", "session": "repl", "profile": true
+    response: {"id": 1, "output": "1\n", "error": null, "unexpected": false, "cursed": 0, "status": 0}
+
+Requests naming the same "session" on one connection share their scope and modules, like the
+lines typed into the interactive shell; the session ends with the connection. "cwd" is where
+modules imported by "source" requests are looked for. With "profile" the response also holds
+the specialization counts of the run under "profile".
+
+Without --socket the protocol runs over stdin/stdout. With --socket the server listens on a
+Unix socket and forks --workers processes up front which accept connections themselves.
+Compiled trees are cached per worker; files given with --preload are compiled before forking
+so every worker shares them. Every request outside a session runs the modules it imports
+afresh, so they print to its own output, but their compiled trees stay cached in the worker
+too. A worker serves one connection at a time, so an open interactive session keeps its worker
+busy until it ends.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+
+from inu_client import DEFAULT_SOCKET, PRIVATE_DIRECTORY
+from inu_exceptions import InumakiException, SourceIndex
+from inu_interpreter import Interpreter
+from inu_modules import Modules, compile_source
+from inu_output import Output
+from inu_specialize import profile
+from inu_stdlib import create_scope
+
+DEFAULT_CACHE_SIZE = 256
+
+# Interactive sessions hold a worker each, keep a few spare even on small machines
+DEFAULT_WORKERS = max(os.cpu_count() or 1, 4)
+
+
+class CompileCache:
+    """
+    Compiled trees and their SourceIndex keyed by source text, dropping the oldest entry once
+    full.
+    """
+
+    def __init__(self, size=DEFAULT_CACHE_SIZE):
+        self.size = size
+        self.entries = {}
+
+    def get(self, text, float_numbers=False):
+        key = (text, float_numbers)
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            source = SourceIndex(text)
+            try:
+                entry = (compile_source(text, float_numbers=float_numbers), source)
+            except InumakiException as e:
+                e.source = source
+                raise
+            if len(self.entries) >= self.size:
+                del self.entries[next(iter(self.entries))]
+        self.entries[key] = entry  # most recently used entries live at the end
+        return entry
+
+
+class Session:
+    """Scope, output and modules kept between the requests of one interactive session."""
+
+    def __init__(self, directory, float_numbers=False):
+        self.output = Output.memory()
+        self.scope = create_scope(self.output)
+        self.modules = Modules([directory], output=self.output, float_numbers=float_numbers)
+
+
+def handle(request, cache, sessions=None):
+    """Run one request and build its response. `sessions` holds the sessions of the connection."""
+    response = {"id": request.get("id"), "output": "", "error": None, "unexpected": False, "cursed": 0, "status": 0}
+    output = Output.memory()
+    interpreter = None
+    before = profile.copy() if request.get("profile") else None
+    try:
+        if "source" in request:
+            text = request["source"]
+            directory = request.get("cwd") or os.getcwd()
+        else:
+            with open(request["path"], "r") as file:
+                text = file.read()
+            directory = os.path.dirname(os.path.abspath(request["path"]))
+
+        float_numbers = request.get("float_numbers", False)
+        ast, source = cache.get(text, float_numbers=float_numbers)
+        if request.get("session") is not None and sessions is not None:
+            session = sessions.get(request["session"])
+            if session is None:
+                session = sessions[request["session"]] = Session(directory, float_numbers)
+            output, scope, modules = session.output, session.scope, session.modules
+        else:
+            scope = create_scope(output)
+            modules = Modules([directory], output=output, float_numbers=float_numbers)
+        interpreter = Interpreter(ast, scope=scope, cursed=0, output=output, modules=modules)
+        try:
+            interpreter.run()
+        except InumakiException as e:
+            if e.source is None:  # errors raised while loading a module carry that module's source
+                e.source = source
+            raise
+    except InumakiException as e:
+        response["error"] = str(e)
+    except Exception as e:
+        response["error"] = str(e)
+        response["unexpected"] = True
+
+    response["output"] = output.take()
+    if before is not None:
+        response["profile"] = dict(profile - before)
+    if interpreter is not None:
+        response["cursed"] = interpreter.cursed
+    if response["error"] is not None:
+        response["status"] = 1
+    return response
+
+
+def serve_stream(reader, writer, cache):
+    sessions = {}
+    for line in reader:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError(f"expected a JSON object, got {type(request).__name__}")
+        except ValueError as e:
+            response = {"id": None, "output": "", "error": f"Invalid request: {e}", "unexpected": True,
+                        "cursed": 0, "status": 1}
+        else:
+            response = handle(request, cache, sessions)
+        writer.write(json.dumps(response).encode() + b"\n")
+        writer.flush()
+
+
+def serve_stdio(cache):
+    serve_stream(sys.stdin.buffer, sys.stdout.buffer, cache)
+
+
+def worker_loop(listener, cache):
+    while True:
+        connection, _ = listener.accept()
+        with connection, connection.makefile("rwb") as stream:
+            try:
+                serve_stream(stream, stream, cache)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client went away mid-request
+
+
+def spawn_worker(listener, cache):
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        try:
+            worker_loop(listener, cache)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def prepare_socket_path(path):
+    """
+    Make sure the server may bind `path`: create the private socket directory if that is where
+    it goes, and remove a socket of this user left behind by an earlier server. Raises OSError
+    rather than touching anything that belongs to someone else.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if directory == os.path.abspath(PRIVATE_DIRECTORY):
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        info = os.lstat(directory)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+            raise PermissionError(f"{directory} must be a directory only you can use, not listening there")
+    try:
+        info = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        raise FileExistsError(f"{path} exists and is not a socket of yours, not removing it")
+    os.unlink(path)
+
+
+def serve_socket(path, workers, cache):
+    prepare_socket_path(path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(64)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    children = {spawn_worker(listener, cache) for _ in range(workers)}
+    print(f"inumaki server listening on {path} with {workers} workers", file=sys.stderr)
+    try:
+        while True:
+            pid, _ = os.wait()
+            # A worker only exits when something went badly wrong, keep the pool full
+            children.discard(pid)
+            children.add(spawn_worker(listener, cache))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        listener.close()
+        os.unlink(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="inumaki serve", description="Run Inumaki programs from a warm server")
+    parser.add_argument(
+        "--socket",
+        type=str,
+        nargs="?",
+        const=DEFAULT_SOCKET,
+        default=None,
+        help=f"listen on a Unix socket (default path {DEFAULT_SOCKET}) instead of stdin/stdout",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="number of preforked workers")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="compiled programs kept per worker")
+    parser.add_argument("--preload", nargs="*", default=[], help="compile these files before forking the workers")
+    args = parser.parse_args(argv)
+
+    cache = CompileCache(args.cache_size)
+    for path in args.preload:
+        with open(path, "r") as file:
+            cache.get(file.read())
+
+    if args.socket is None:
+        serve_stdio(cache)
+    else:
+        try:
+            serve_socket(args.socket, args.workers, cache)
+        except OSError as e:
+            print(f"inumaki serve: {e}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
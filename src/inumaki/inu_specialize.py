@@ -0,0 +1,114 @@
+"""
+Operand type specialization.
+
+A BinaryOp starts out calling the generic function from inu_operators. Its first WARMUP
+evaluations record the types of its operands; if they were the same every time and the pair
+has a fast path, the node switches to calling the left type's own slot, such as
+`float.__add__`, directly. That skips the Python level `add` that decides whether to build a
+Rope, and the slot is its own guard: it raises TypeError for a left operand of another type
+and returns NotImplemented for a right operand it does not handle. The interpreter then takes
+the generic path for that evaluation and the node starts warming up again, up to
+RESPECIALIZATIONS times before it stays generic for good.
+
+Nothing changes in the results: every fast path computes exactly what the generic function
+does for the operand types it accepts.
+"""
+
+from collections import Counter
+
+# Evaluations with the same operand types before a node is specialized
+WARMUP = 8
+
+# Guard failures a node recovers from before it stays generic
+RESPECIALIZATIONS = 4
+
+# Marks a node whose operand types changed during its warmup
+MIXED = object()
+
+SLOTS = {
+    "+": "__add__",
+    "-": "__sub__",
+    "*": "__mul__",
+    "/": "__truediv__",
+    "%": "__mod__",
+    "==": "__eq__",
+    "!=": "__ne__",
+    ">": "__gt__",
+    "<": "__lt__",
+    ">=": "__ge__",
+    "<=": "__le__",
+}
+
+# Operand type pairs whose left type's slot handles the right operand itself
+FAST_PAIRS = {
+    (int, int),
+    (int, bool),
+    (bool, int),
+    (bool, bool),
+    (float, float),
+    (float, int),
+    (float, bool),
+    (str, str),
+}
+
+# Pairs that stay generic whatever the operand types: `+` on strings builds a Rope
+GENERIC = {("+", str)}
+
+profile = Counter()  # "specialized", "generic", "guard failures", "despecialized" and one entry per fast path
+
+
+def fast_path(op, left_type, right_type):
+    """The slot to call for `op` on these operand types, or None if the node should stay generic."""
+    if (left_type, right_type) not in FAST_PAIRS or (op, left_type) in GENERIC or op not in SLOTS:
+        return None
+    return getattr(left_type, SLOTS[op], None)
+
+
+def observe(node, left, right):
+    """Record the operand types of a node warming up, specializing it once the warmup is over."""
+    seen = (type(left), type(right))
+    if node.observed is None:
+        node.observed = seen
+    elif node.observed is not MIXED and node.observed != seen:
+        node.observed = MIXED
+    node.warmup -= 1
+    if node.warmup:
+        return
+
+    fast = None if node.observed is MIXED else fast_path(node.op.value, *seen)
+    if fast is None:
+        profile["generic"] += 1
+        return
+    node.fast = fast
+    profile["specialized"] += 1
+    profile[f"{seen[0].__name__} {node.op.value} {seen[1].__name__}"] += 1
+
+
+def miss(node):
+    """The guard of a specialized node failed: warm it up again, or leave it generic for good."""
+    profile["guard failures"] += 1
+    node.fast = None
+    node.observed = None
+    if node.respecializations:
+        node.respecializations -= 1
+        node.warmup = WARMUP
+    else:
+        profile["despecialized"] += 1
+
+
+def report(counts=None):
+    """Lines describing the specializations counted in `counts`, by default all made so far, for --profile."""
+    if counts is None:
+        counts = profile
+    lines = [
+        "Specialization profile:",
+        f"  operator nodes specialized: {counts['specialized']}",
+        f"  operator nodes left generic: {counts['generic']}",
+        f"  guard failures: {counts['guard failures']}",
+        f"  nodes despecialized after repeated failures: {counts['despecialized']}",
+    ]
+    summary = {"specialized", "generic", "guard failures", "despecialized"}
+    paths = sorted((count, name) for name, count in counts.items() if name not in summary)
+    for count, name in reversed(paths):
+        lines.append(f"  {name}: {count}")
+    return lines
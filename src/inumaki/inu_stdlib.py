@@ -1 +1,28 @@
-inu_stdlib = {"Tuna_Tuna": print, "str": str, "float": float}
+from inu_parallel import parallel_map, parallel_reduce
+
+inu_stdlib = {
+    "Tuna_Tuna": print,
+    "str": str,
+    "float": float,
+    "Parallel_Map": parallel_map,
+    "Parallel_Reduce": parallel_reduce,
+}
+
+# Builtins that call back into the Inumaki functions they are given
+CALLBACK_BUILTINS = {"Parallel_Map", "Parallel_Reduce"}
+
+# Builtins bound to the same object in every scope, unlike Tuna_Tuna which writes to the run's output
+CONSTANT_BUILTINS = {name for name in inu_stdlib if name != "Tuna_Tuna"}
+
+# Python modules behind `Salmon_Roe <name>`, only imported by the programs that ask for them.
+# Each one provides its members as a dict called `exports`.
+native_modules = {
+    "math": "inu_stdlib_math",
+    "string": "inu_stdlib_string",
+    "collections": "inu_stdlib_collections",
+}
+
+
+def create_scope(output):
+    """Global scope for a run whose Tuna_Tuna writes to `output`."""
+    return {**inu_stdlib, "Tuna_Tuna": output.print}
@@ -0,0 +1,53 @@
+"""`Salmon_Roe collections`: lists and dictionaries, indexed with `[...]` like any other value."""
+
+
+def make_list(*items):
+    return list(items)
+
+
+def make_range(*bounds):
+    return list(range(*bounds))
+
+
+def push(items, value):
+    """Append `value` to `items` and return the list, so calls can be chained."""
+    items.append(value)
+    return items
+
+
+def pop(items):
+    return items.pop()
+
+
+def put(mapping, key, value):
+    """Store `value` under `key` and return the container."""
+    mapping[key] = value
+    return mapping
+
+
+def has(container, key):
+    return key in container
+
+
+def keys(mapping):
+    return list(mapping)
+
+
+def reverse(items):
+    return items[::-1]
+
+
+exports = {
+    "list": make_list,
+    "dict": dict,
+    "range": make_range,
+    "length": len,
+    "push": push,
+    "pop": pop,
+    "put": put,
+    "has": has,
+    "keys": keys,
+    "sum": sum,
+    "sorted": sorted,
+    "reversed": reverse,
+}
@@ -0,0 +1,20 @@
+"""`Salmon_Roe math`: numeric helpers."""
+
+import math
+
+exports = {
+    "pi": math.pi,
+    "e": math.e,
+    "sqrt": math.sqrt,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "round": round,
+    "abs": abs,
+    "pow": pow,
+    "min": min,
+    "max": max,
+    "log": math.log,
+    "sin": math.sin,
+    "cos": math.cos,
+    "gcd": math.gcd,
+}
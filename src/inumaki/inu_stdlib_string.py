@@ -0,0 +1,29 @@
+"""`Salmon_Roe string`: text helpers. Arguments arrive as plain strings."""
+
+
+def contains(text, part):
+    return part in text
+
+
+def repeat(text, times):
+    return text * times
+
+
+def join(separator, items):
+    return separator.join(str(item) for item in items)
+
+
+exports = {
+    "length": len,
+    "upper": str.upper,
+    "lower": str.lower,
+    "strip": str.strip,
+    "split": str.split,
+    "replace": str.replace,
+    "find": str.find,
+    "starts_with": str.startswith,
+    "ends_with": str.endswith,
+    "contains": contains,
+    "repeat": repeat,
+    "join": join,
+}
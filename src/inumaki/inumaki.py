@@ -1,60 +1,121 @@
 import argparse
+import atexit
+import os
 import sys
 
 from inu_interpreter import Interpreter
-from inu_lexer import Lexer
-from inu_parser import Parser
-from inu_stdlib import inu_stdlib
-from inu_exceptions import InumakiException
+from inu_modules import Modules, compile_source
+from inu_output import FLUSH_POLICIES, DEFAULT_BUFFER_SIZE, Output
+from inu_specialize import report
+from inu_stdlib import create_scope
+from inu_exceptions import InumakiException, SourceIndex
 
 parser = argparse.ArgumentParser(prog="inumaki", description="Inumkai programming language")
 parser.add_argument("file", type=str, help="Inumaki source code file", nargs="?", default=None)
+parser.add_argument(
+    "--float-numbers",
+    action="store_true",
+    help="treat every number literal as a float (behaviour of older Inumaki versions)",
+)
+parser.add_argument("--output", type=str, default=None, help="write program output to this file instead of stdout")
+parser.add_argument(
+    "--flush",
+    choices=FLUSH_POLICIES,
+    default=None,
+    help="when buffered output is flushed (default: line on a terminal, size otherwise)",
+)
+parser.add_argument("--buffer-size", type=int, default=DEFAULT_BUFFER_SIZE, help="buffer size for --flush size")
+parser.add_argument(
+    "--profile",
+    action="store_true",
+    help="report on stderr how many operator nodes were specialized and how often their guards failed",
+)
 
-args = parser.parse_args()
 
+def run(text, filename=None, scope=None, output=None, float_numbers=False, modules=None):
+    if output is None:
+        output = Output()
+    if scope is None:
+        scope = create_scope(output)
+    if modules is None:
+        directory = os.path.dirname(os.path.abspath(filename)) if filename else os.getcwd()
+        modules = Modules([directory], output=output, float_numbers=float_numbers)
 
-def run(text, filename=None):
     try:
-        lexer = Lexer(text)
-        lexer.scan_tokens()
+        ast = compile_source(text, float_numbers=float_numbers)
 
-        parser = Parser(lexer.tokens)
-        parser.parse()
-
-        interpreter = Interpreter(parser.ast, scope=inu_stdlib, cursed=0)
+        interpreter = Interpreter(ast, scope=scope, cursed=0, output=output, modules=modules)
         interpreter.run()
     except InumakiException as e:
+        # Anything printed before the error should appear before the error message
+        output.flush()
+        if e.source is None:
+            e.source = SourceIndex(text)
         # Print the enhanced error message
         if filename:
             print(f"Error in {filename}:", file=sys.stderr)
         print(str(e), file=sys.stderr)
         sys.exit(1)
     except Exception as e:
+        output.flush()
         # Handle any unexpected errors
         if filename:
             print(f"Unexpected error in {filename}: {e}", file=sys.stderr)
         else:
             print(f"Unexpected error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        output.flush()
+
+
+def print_profile():
+    for line in report():
+        print(line, file=sys.stderr)
+
+
+def main():
+    if sys.argv[1:2] == ["serve"]:
+        from inu_server import main as serve
 
+        return serve(sys.argv[2:])
+    if sys.argv[1:2] == ["check"]:
+        from inu_check import main as check
 
-if args.file:
-    with open(args.file, "r") as file:
-        text = file.read()
+        return check(sys.argv[2:])
 
-    run(text, args.file)
-else:
-    print("Inumaki Interactive Shell")
-    print("Enter Inumaki code (Ctrl+C or Ctrl+D to exit)")
-    while True:
-        try:
-            text = input("inumaki> ")
-        except (EOFError, KeyboardInterrupt):
-            print("\nBye!")
-            break
+    args = parser.parse_args()
 
-        if text.strip():  # Only run if there's actual content
+    policy = args.flush
+    if policy is None:
+        policy = "line" if args.output is None and sys.stdout.isatty() else "size"
+    output = Output(args.output, policy=policy, buffer_size=args.buffer_size)
+    atexit.register(output.close)
+    if args.profile:
+        atexit.register(print_profile)
+
+    if args.file:
+        with open(args.file, "r") as file:
+            text = file.read()
+
+        run(text, args.file, output=output, float_numbers=args.float_numbers)
+    else:
+        print("Inumaki Interactive Shell")
+        print("Enter Inumaki code (Ctrl+C or Ctrl+D to exit)")
+        scope = create_scope(output)
+        modules = Modules([os.getcwd()], output=output, float_numbers=args.float_numbers)
+        while True:
             try:
-                run(text)
-            except SystemExit:
-                pass  # Error already handled and printed
+                text = input("inumaki> ")
+            except (EOFError, KeyboardInterrupt):
+                print("\nBye!")
+                break
+
+            if text.strip():  # Only run if there's actual content
+                try:
+                    run(text, scope=scope, output=output, float_numbers=args.float_numbers, modules=modules)
+                except SystemExit:
+                    pass  # Error already handled and printed
+
+
+if __name__ == "__main__":
+    main()
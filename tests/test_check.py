@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from inu_check import check_source
+from inu_exceptions import CursedSpeechOverloadError, InumakiException
+from inu_interpreter import Interpreter
+from inu_modules import compile_source
+from inu_output import Output
+from inu_stdlib import create_scope
+
+SAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples")
+
+PROGRAMS = {
+    "straight line": "Tuna crush Tuna 1\nTuna twist Tuna crush + crush\n",
+    "counted loop": "Twist Tuna Tuna i Tuna 0 Tuna i < 30 Tuna Tuna i Tuna i + 1 Tuna {\n    Tuna crush Tuna 1\n}\n",
+    "counted loop overloading": "Twist Tuna Tuna i Tuna 0 Tuna i < 200 Tuna Tuna i Tuna i + 1 Tuna {\n"
+                                "    Tuna crush Tuna 1\n}\n",
+    "while loop": "Tuna n Tuna 0\nPlummet Tuna n < 5 Tuna {\n    Tuna n Tuna n + 1\n    Tuna crush Tuna n\n}\n",
+    "cough syrup": "Twist Tuna Tuna i Tuna 0 Tuna i < 300 Tuna Tuna i Tuna i + 1 Tuna {\n"
+                   "    Tuna crush Tuna 1\n    Cough_Syrup\n}\nTuna blast Tuna 2\n",
+    "conditional": "Tuna x Tuna 3\nMustard_Leaf Tuna x > 2 Tuna {\n    Tuna crush Tuna 1\n} Explode {\n"
+                   "    Tuna y Tuna 1\n}\n",
+    "function called from its block": "Tuna_Mayo blast Tuna n Tuna {\n    Return n + 1\n}\n"
+                                      "Tuna crush Tuna blast(1)\nTuna crush Tuna blast(crush)\n",
+    "function called from a loop": "Tuna_Mayo blast Tuna n Tuna {\n    Return n\n}\n"
+                                   "Twist Tuna Tuna i Tuna 0 Tuna i < 10 Tuna Tuna i Tuna i + 1 Tuna {\n"
+                                   "    Tuna crush Tuna blast(i)\n}\n",
+    "recursion": "Tuna_Mayo fib Tuna n Tuna {\n    Mustard_Leaf Tuna n < 2 Tuna {\n        Return n\n    }\n"
+                 "    Return fib(n - 1) + fib(n - 2)\n}\nTuna_Tuna(fib(6))\n",
+    "stop and run": "Twist Tuna Tuna i Tuna 0 Tuna i < 50 Tuna Tuna i Tuna i + 1 Tuna {\n"
+                    "    Mustard_Leaf Tuna i % 2 == 0 Tuna {\n        Run\n    }\n"
+                    "    Mustard_Leaf Tuna i > 20 Tuna {\n        Stop\n    }\n    Tuna crush Tuna i\n}\n",
+    "short circuit": "Tuna crush Tuna 1\nTuna a Tuna Bonito_Flakes And crush\nTuna b Tuna Salmon Or crush\n"
+                     "Tuna c Tuna crush Or crush\n",
+    "division by zero first": "Tuna x Tuna 1 / 0\nTwist Tuna Tuna i Tuna 0 Tuna i < 200 Tuna Tuna i Tuna i + 1 Tuna {\n"
+                              "    Tuna crush Tuna 1\n}\n",
+    "deep recursion first": "Tuna_Mayo h Tuna n Tuna {\n    Mustard_Leaf Tuna n > 0 Tuna {\n        Return h(n - 1)\n"
+                            "    }\n    Return 0\n}\nTuna x Tuna h(5000)\n"
+                            "Twist Tuna Tuna i Tuna 0 Tuna i < 200 Tuna Tuna i Tuna i + 1 Tuna {\n"
+                            "    Tuna crush Tuna 1\n}\n",
+}
+
+
+def run(text):
+    """The interpreter's cursed count at the end of the program, "overload" or "error"."""
+    output = Output.memory()
+    interpreter = Interpreter(compile_source(text), scope=create_scope(output), cursed=0, output=output)
+    try:
+        interpreter.run()
+    except CursedSpeechOverloadError:
+        return "overload"
+    except InumakiException:
+        return "error"
+    return interpreter.cursed
+
+
+def sample(name):
+    with open(os.path.join(SAMPLES, name), "r") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("text", [*PROGRAMS.values(), sample("FizzBuzz.inu"), sample("hello.inu"),
+                                  sample("cursed_speech_overload.inu")],
+                         ids=[*PROGRAMS, "FizzBuzz", "hello", "cursed_speech_overload"])
+def test_bounds_contain_the_runtime_count(text):
+    actual = run(text)
+    report = check_source(text)
+    if actual == "overload":
+        assert report.overloads or report.warnings
+    else:
+        assert not report.guaranteed
+        if actual != "error":
+            assert report.final is not None
+            assert report.final.lower <= actual <= report.final.upper
+
+
+def test_counted_loop_is_exact():
+    report = check_source(PROGRAMS["counted loop"])
+    assert report.final.lower == report.final.upper == run(PROGRAMS["counted loop"])
+
+
+def test_guaranteed_overload():
+    report = check_source(PROGRAMS["counted loop overloading"])
+    assert run(PROGRAMS["counted loop overloading"]) == "overload"
+    assert report.guaranteed
+
+
+@pytest.mark.parametrize("name", ["division by zero first", "deep recursion first"])
+def test_an_earlier_error_is_not_a_guaranteed_overload(name):
+    text = PROGRAMS[name]
+    report = check_source(text)
+    assert run(text) == "error"
+    assert report.overloads
+    assert not report.guaranteed
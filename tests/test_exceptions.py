@@ -0,0 +1,71 @@
+import pickle
+
+import pytest
+
+from inu_exceptions import InumakiFunctionError, InumakiRuntimeError, SourceIndex, create_function_call_error
+from inu_interpreter import Interpreter
+from inu_modules import compile_source
+from inu_output import Output
+from inu_stdlib import create_scope
+
+TEXT = "Tuna x Tuna 1\n\nTuna_Tuna(x)\nlast line"
+
+
+@pytest.mark.parametrize("line, expected", [(1, "Tuna x Tuna 1"), (2, ""), (3, "Tuna_Tuna(x)"), (4, "last line"),
+                                            (0, None), (5, None), (None, None)])
+def test_line_text(line, expected):
+    assert SourceIndex(TEXT).line_text(line) == expected
+
+
+def test_line_text_of_a_trailing_newline():
+    index = SourceIndex("Tuna x Tuna 1\n")
+    assert index.line_text(1) == "Tuna x Tuna 1"
+    assert index.line_text(2) == ""
+
+
+def test_position_matches_a_scan_of_the_text():
+    index = SourceIndex(TEXT)
+    for offset in range(len(TEXT)):
+        before = TEXT[:offset]
+        assert index.position(offset) == (before.count("\n") + 1, offset - (before.rfind("\n") + 1))
+
+
+def test_nothing_is_formatted_until_str():
+    calls = []
+
+    def message():
+        calls.append(1)
+        return "expensive"
+
+    error = InumakiRuntimeError(message=message, line=3, source=SourceIndex(TEXT))
+    assert calls == [] and error._formatted is None
+    assert str(error) == "InumakiRuntimeError: expensive\n  at line 3\n  Code: Tuna_Tuna(x)"
+    str(error)
+    assert calls == [1]
+
+
+def test_wrapped_errors_are_only_formatted_with_the_outer_one():
+    inner = InumakiRuntimeError(message="inner")
+    outer = create_function_call_error("f", inner)
+    assert inner._formatted is None and outer._formatted is None
+    assert str(outer) == ("InumakiFunctionError: Error calling function 'f': InumakiRuntimeError: inner\n"
+                          "  Suggestion: Check function name, parameters, and that the function is defined")
+
+
+def test_deep_chain_is_formatted_without_recursing():
+    error = InumakiRuntimeError(message="bottom")
+    for level in range(20000):
+        error = create_function_call_error(f"f{level}", error)
+    text = str(error)
+    assert text.startswith("InumakiFunctionError: Error calling function 'f19999': ")
+    assert text.count("Error calling function") == 20000
+    assert "InumakiRuntimeError: bottom" in text
+    copy = pickle.loads(pickle.dumps(error))
+    assert str(copy) == text
+
+
+def test_runaway_recursion_reports_a_function_error():
+    text = "Tuna_Mayo h Tuna Tuna {\n Return h()\n}\nTuna x Tuna h()\n"
+    with pytest.raises(InumakiFunctionError) as info:
+        Interpreter(compile_source(text), create_scope(Output.memory()), 0).run()
+    assert str(info.value).startswith("InumakiFunctionError: Error calling function 'h': ")
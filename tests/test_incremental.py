@@ -0,0 +1,85 @@
+import os
+import random
+
+import pytest
+
+from inu_incremental import IncrementalDocument
+from inu_lexer import Lexer, Token
+from inu_parser import Parser
+
+SAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples")
+
+PIECES = ["\n", "Tuna", " ", "+ 1", '"', "'", "{", "}", "}\n", "$", "Tuna x Tuna 3\n", '"a\nb"', "(", ")", "Kelp ",
+          "Twist", "x", ""]
+
+
+def dump(value):
+    """Plain data view of tokens and trees, so two documents can be compared with ==."""
+    if isinstance(value, Token):
+        return value.type, value.value, value.line, value.column
+    if isinstance(value, list):
+        return [dump(item) for item in value]
+    if hasattr(value, "__match_args__"):
+        return type(value).__name__, {name: dump(item) for name, item in vars(value).items()}
+    return value
+
+
+def state(document):
+    return {
+        "tokens": dump(document.tokens),
+        "ast": dump(document.ast),
+        "diagnostics": [(type(error).__name__, error.message, error.line, error.column)
+                        for error in document.diagnostics],
+        "statements": [(statement.first_line, statement.last_line) for statement in document.statements],
+    }
+
+
+def sample_text():
+    names = ["hello.inu", "FizzBuzz.inu", "cursed_speech_overload.inu"]
+    texts = []
+    for name in names:
+        with open(os.path.join(SAMPLES, name), "r") as file:
+            texts.append(file.read())
+    return "\n".join(texts)
+
+
+def test_new_document_matches_the_full_parser():
+    text = sample_text()
+    lexer = Lexer(text)
+    lexer.scan_tokens()
+    parser = Parser(lexer.tokens)
+    parser.parse()
+    assert dump(IncrementalDocument(text).ast) == dump(parser.ast)
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        (5, 0, 5, 0, "Tuna y Tuna 2\n"),  # insert a statement
+        (5, 0, 5, 0, '"'),  # open a string to the end of the file
+        (5, 0, 5, 0, "{"),  # unbalanced brace
+        (3, 0, 6, 0, ""),  # delete several lines
+        (10, 2, 10, 2, "$"),  # lexing error
+    ],
+)
+def test_single_edit_matches_a_new_document(edit):
+    document = IncrementalDocument(sample_text())
+    document.edit(*edit)
+    assert state(document) == state(IncrementalDocument(document.text))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_edits_match_a_new_document(seed):
+    chooser = random.Random(seed)
+    document = IncrementalDocument(sample_text())
+    for _ in range(300):
+        lines = document.lines
+        first = chooser.randrange(len(lines))
+        last = min(len(lines) - 1, first + chooser.choice([0, 0, 0, 1, 2]))
+        start = chooser.randint(0, len(lines[first]))
+        end = chooser.randint(0, len(lines[last])) if last != first else chooser.randint(start, len(lines[first]))
+        text = chooser.choice(PIECES)
+        edit = (first + 1, start, last + 1, end, text)
+
+        document.edit(*edit)
+        assert state(document) == state(IncrementalDocument(document.text)), edit
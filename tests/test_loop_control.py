@@ -0,0 +1,146 @@
+import pytest
+
+from inu_exceptions import InumakiParseError
+from inu_interpreter import Interpreter
+from inu_lexer import Lexer
+from inu_modules import compile_source
+from inu_output import Output
+from inu_parser import Parser
+from inu_stdlib import create_scope
+
+
+def parse(text):
+    lexer = Lexer(text)
+    lexer.scan_tokens()
+    parser = Parser(lexer.tokens)
+    parser.parse()
+    return parser.ast
+
+
+def run(text, optimized=True):
+    output = Output.memory()
+    tree = compile_source(text) if optimized else parse(text)
+    Interpreter(tree, create_scope(output), 0, output=output).run()
+    return output.getvalue().split()
+
+
+PROGRAMS = {
+    "stop leaves only the inner loop": ("""Twist Tuna Tuna i Tuna 0 Tuna i < 3 Tuna Tuna i Tuna i + 1 Tuna {
+    Twist Tuna Tuna j Tuna 0 Tuna j < 5 Tuna Tuna j Tuna j + 1 Tuna {
+        Mustard_Leaf Tuna j == 2 Tuna {
+            Stop
+        }
+        Tuna_Tuna(i * 10 + j)
+    }
+    Tuna_Tuna(j)
+}
+""", "0 1 2 10 11 2 20 21 2"),
+    "run skips the rest of the inner body": ("""Twist Tuna Tuna i Tuna 0 Tuna i < 2 Tuna Tuna i Tuna i + 1 Tuna {
+    Twist Tuna Tuna j Tuna 0 Tuna j < 4 Tuna Tuna j Tuna j + 1 Tuna {
+        Mustard_Leaf Tuna j % 2 == 0 Tuna {
+            Run
+        }
+        Tuna_Tuna(i * 10 + j)
+    }
+    Tuna_Tuna("end", j)
+}
+""", "1 3 end 4 11 13 end 4"),
+    "stop deep in conditionals": ("""Tuna n Tuna 0
+Plummet Tuna Salmon Tuna {
+    Tuna n Tuna n + 1
+    Mustard_Leaf Tuna n > 2 Tuna {
+        Mustard_Leaf Tuna n == 3 Tuna {
+            Tuna_Tuna("no")
+        } Explode {
+            Mustard_Leaf Tuna Salmon Tuna {
+                Stop
+            }
+        }
+    }
+    Tuna_Tuna(n)
+}
+Tuna_Tuna("after", n)
+""", "1 2 no 3 after 4"),
+    "run in an else branch": ("""Twist Tuna Tuna i Tuna 0 Tuna i < 5 Tuna Tuna i Tuna i + 1 Tuna {
+    Mustard_Leaf Tuna i < 3 Tuna {
+        Tuna_Tuna("low", i)
+    } Explode {
+        Run
+    }
+    Tuna_Tuna(i)
+}
+""", "low 0 0 low 1 1 low 2 2"),
+    "run still runs the twist increment": ("""Tuna k Tuna 5
+Twist Tuna Tuna i Tuna 0 Tuna i < k Tuna Tuna i Tuna i + 1 Tuna {
+    Tuna k Tuna 5
+    Run
+    Tuna_Tuna("never")
+}
+Tuna_Tuna(i)
+""", "5"),
+    "run with a generic increment": ("""Twist Tuna Tuna i Tuna 1 Tuna i < 50 Tuna Tuna i Tuna i * 2 Tuna {
+    Mustard_Leaf Tuna i == 4 Tuna {
+        Run
+    }
+    Tuna_Tuna(i)
+}
+Tuna_Tuna("end", i)
+""", "1 2 8 16 32 end 64"),
+    "run in a while loop": ("""Tuna n Tuna 0
+Plummet Tuna n < 5 Tuna {
+    Tuna n Tuna n + 1
+    Mustard_Leaf Tuna n % 2 == 1 Tuna {
+        Run
+    }
+    Tuna_Tuna(n)
+}
+""", "2 4"),
+    "stop inside a function ends its own loop": ("""Tuna_Mayo first Tuna limit Tuna {
+    Twist Tuna Tuna i Tuna 0 Tuna i < 100 Tuna Tuna i Tuna i + 1 Tuna {
+        Mustard_Leaf Tuna i * i > limit Tuna {
+            Stop
+        }
+    }
+    Return i
+}
+Twist Tuna Tuna j Tuna 0 Tuna j < 3 Tuna Tuna j Tuna j + 1 Tuna {
+    Tuna_Tuna(first(j * 10))
+}
+""", "1 4 5"),
+}
+
+
+@pytest.mark.parametrize("optimized", [True, False], ids=["optimized", "generic"])
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_stop_and_run(name, optimized):
+    text, expected = PROGRAMS[name]
+    assert run(text, optimized) == expected.split()
+
+
+@pytest.mark.parametrize("text", [
+    "Stop\n",
+    "Run\n",
+    "Mustard_Leaf Tuna Salmon Tuna {\n    Stop\n}\n",
+    "Tuna_Mayo f Tuna Tuna {\n    Run\n}\n",
+    "Plummet Tuna Salmon Tuna {\n    Tuna_Mayo f Tuna Tuna {\n        Stop\n    }\n}\n",
+    "Twist Tuna Tuna i Tuna 0 Tuna i < 3 Tuna Tuna i Tuna i + 1 Tuna {\n    Tuna_Mayo f Tuna Tuna {\n"
+    "        Mustard_Leaf Tuna Salmon Tuna {\n            Run\n        }\n    }\n}\n",
+])
+def test_stop_and_run_outside_of_a_loop_are_parse_errors(text):
+    with pytest.raises(InumakiParseError) as info:
+        parse(text)
+    assert "outside of a loop" in info.value.message
+
+
+def test_loop_inside_a_function_inside_a_loop_may_stop():
+    text = """Twist Tuna Tuna i Tuna 0 Tuna i < 2 Tuna Tuna i Tuna i + 1 Tuna {
+    Tuna_Mayo f Tuna Tuna {
+        Plummet Tuna Salmon Tuna {
+            Stop
+        }
+        Return i
+    }
+    Tuna_Tuna(f())
+}
+"""
+    assert run(text) == ["0", "1"]
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+import inu_modules
+from inu_exceptions import InumakiFunctionError
+from inu_interpreter import Interpreter
+from inu_modules import Modules, cache_path, compile_source, load_tree, read_cache
+from inu_output import Output
+from inu_stdlib import create_scope
+
+
+@pytest.fixture
+def cached(tmp_path, monkeypatch):
+    """A module compiled once, so its cache file exists, and the stamp the cache was written for."""
+    monkeypatch.setattr(inu_modules, "_compiled", {})
+    path = tmp_path / "geometry.inu"
+    path.write_text("Tuna side Tuna 2\n")
+    old = os.umask(0o002)  # group writable by default, which the cache must not inherit
+    try:
+        load_tree(str(path))
+    finally:
+        os.umask(old)
+    info = os.stat(path)
+    return cache_path(str(path)), (info.st_size, info.st_mtime_ns)
+
+
+def test_cache_written_by_the_current_user_is_read(cached):
+    cache, stamp = cached
+    assert os.stat(cache).st_mode & 0o022 == 0
+    assert read_cache(cache, stamp) is not None
+    assert read_cache(cache, (0, 0)) is None
+
+
+@pytest.mark.parametrize("mode", [0o664, 0o646, 0o666])
+def test_cache_others_could_write_is_ignored(cached, mode):
+    cache, stamp = cached
+    os.chmod(cache, mode)
+    assert read_cache(cache, stamp) is None
+
+
+def test_cache_behind_a_symlink_is_ignored(cached, tmp_path):
+    cache, stamp = cached
+    link = tmp_path / "link.pickle"
+    link.symlink_to(cache)
+    assert read_cache(str(link), stamp) is None
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid") or os.getuid() != 0, reason="changing the owner needs root")
+def test_cache_owned_by_another_user_is_ignored(cached):
+    cache, stamp = cached
+    os.chown(cache, 65534, -1)
+    assert read_cache(cache, stamp) is None
+
+
+def test_errors_in_member_calls_name_the_member(tmp_path):
+    (tmp_path / "geometry.inu").write_text("Tuna_Mayo area Tuna r Tuna {\n    Return r * r\n}\n")
+    output = Output.memory()
+    tree = compile_source("Salmon_Roe geometry\ngeometry.nope(1)\n")
+    interpreter = Interpreter(tree, create_scope(output), 0, output=output, modules=Modules([str(tmp_path)], output))
+    with pytest.raises(InumakiFunctionError) as info:
+        interpreter.run()
+    assert str(info.value).startswith("InumakiFunctionError: Error calling function 'geometry.nope': ")
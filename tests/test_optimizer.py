@@ -0,0 +1,119 @@
+import pytest
+
+from inu_ast import Call, For
+from inu_exceptions import InumakiFunctionError
+from inu_interpreter import Interpreter
+from inu_lexer import Lexer
+from inu_modules import compile_source
+from inu_optimizer import walk
+from inu_output import Output
+from inu_parser import Parser
+from inu_stdlib import create_scope
+
+
+def run(text):
+    output = Output.memory()
+    interpreter = Interpreter(compile_source(text), create_scope(output), 0, output=output)
+    interpreter.run()
+    return output.getvalue(), interpreter.cursed
+
+
+def resolved(text):
+    return {node.name.name: node.builtin for node in walk(compile_source(text)) if isinstance(node, Call)}
+
+
+def test_builtins_the_program_never_binds_are_resolved():
+    assert resolved("Tuna x Tuna float(str(1))\nTuna_Tuna(x)\n") == {"float": float, "str": str, "Tuna_Tuna": None}
+
+
+@pytest.mark.parametrize("binding", [
+    "Tuna str Tuna 1",
+    "Tuna_Mayo str Tuna x Tuna {\n    Return x\n}",
+    "Tuna_Mayo f Tuna str Tuna {\n    Return str\n}",
+    "Mustard_Leaf Tuna Salmon Tuna {\n    Tuna str Tuna 1\n}",
+    "Salmon_Roe str",
+])
+def test_builtins_bound_anywhere_in_the_program_are_not_resolved(binding):
+    assert resolved(f"{binding}\nTuna_Tuna(str(1))\n")["str"] is None
+
+
+def test_resolved_builtins_give_the_generic_results():
+    text = 'Tuna s Tuna "a"\nTuna s Tuna s + "b"\nTuna_Tuna(str(s), float(str(2)) + 1, str(3 + 4))\n'
+    assert run(text)[0] == "ab 3.0 7\n"
+
+
+def test_scope_binding_over_a_resolved_builtin_wins():
+    output = Output.memory()
+    scope = create_scope(output)
+    scope["str"] = lambda value: f"<{value}>"
+    Interpreter(compile_source("Tuna_Tuna(str(1))\n"), scope, 0, output=output).run()
+    assert output.getvalue() == "<1>\n"
+
+
+def test_closure_sees_a_builtin_rebound_by_a_later_program():
+    # Two programs sharing one scope, like REPL lines in one session
+    output = Output.memory()
+    scope = create_scope(output)
+    Interpreter(compile_source("Tuna_Mayo g Tuna Tuna {\n    Return str(1)\n}\n"), scope, 0, output=output).run()
+    Interpreter(compile_source("Tuna str Tuna 5\n"), scope, 0, output=output).run()
+    with pytest.raises(InumakiFunctionError):
+        Interpreter(compile_source("Tuna_Tuna(g())\n"), scope, 0, output=output).run()
+
+
+def loop(variable, start, condition, step, body="    Tuna_Tuna({v})", before=""):
+    return (f"{before}Twist Tuna Tuna {variable} Tuna {start} Tuna {condition} Tuna "
+            f"Tuna {variable} Tuna {variable} {step} Tuna {{\n{body.format(v=variable)}\n}}\n"
+            f"Tuna_Tuna({variable})\n")
+
+
+# name -> (program, whether the optimizer turns its loop into a counted one)
+COUNTED_LOOPS = {
+    "increasing": (loop("i", 0, "i < 10", "+ 1"), True),
+    "step": (loop("i", 1, "i < 20", "+ 3"), True),
+    "decreasing": (loop("i", 10, "i > 0", "- 2"), True),
+    "inclusive": (loop("i", 0, "i <= 9", "+ 3"), True),
+    "inclusive decreasing": (loop("i", 9, "i >= 0", "- 3"), True),
+    "empty": (loop("i", 5, "i < 5", "+ 1"), True),
+    "empty decreasing": (loop("i", 0, "i > 3", "- 1"), True),
+    "start past the bound": (loop("i", 50, "i < 5", "+ 1"), True),
+    "var bound": (loop("i", 0, "i < n", "+ 1", before="Tuna n Tuna 7\n"), True),
+    "float var bound": (loop("i", 0, "i < n", "+ 1", before="Tuna n Tuna 6.5\n"), True),
+    "float start": (loop("i", 0.5, "i < 4", "+ 1"), True),
+    "cursed loop variable": (loop("crush", 0, "crush < 12", "+ 1", body="    Tuna blast Tuna {v}"), True),
+    "cursed bound": (loop("i", 0, "i < crush", "+ 1", before="Tuna crush Tuna 30\nCough_Syrup\n"), True),
+    "stop": (loop("i", 0, "i < 10", "+ 1", body="    Mustard_Leaf Tuna {v} == 4 Tuna {{\n        Stop\n    }}\n"
+                                                    "    Tuna_Tuna({v})"), True),
+    "run": (loop("i", 0, "i < 10", "+ 1", body="    Mustard_Leaf Tuna {v} % 3 == 0 Tuna {{\n        Run\n    }}\n"
+                                                   "    Tuna_Tuna({v})"), True),
+    "stop on the last iteration": (loop("i", 0, "i < 5", "+ 1", body="    Mustard_Leaf Tuna {v} == 4 Tuna {{\n"
+                                                                      "        Stop\n    }}"), True),
+    "bound assigned in the body": (loop("i", 0, "i < n", "+ 1", before="Tuna n Tuna 5\n",
+                                        body="    Tuna n Tuna n - 1"), False),
+    "variable assigned in the body": (loop("i", 0, "i < 10", "+ 1", body="    Tuna i Tuna i + 2"), False),
+}
+
+
+def run_tree(tree):
+    output = Output.memory()
+    scope = create_scope(output)
+    interpreter = Interpreter(tree, scope, 0, output=output)
+    interpreter.run()
+    values = {name: value for name, value in scope.items() if not callable(value)}
+    return output.getvalue(), interpreter.cursed, values
+
+
+def unoptimized(text):
+    lexer = Lexer(text)
+    lexer.scan_tokens()
+    parser = Parser(lexer.tokens)
+    parser.parse()
+    return parser.ast
+
+
+@pytest.mark.parametrize("name", COUNTED_LOOPS)
+def test_counted_loops_run_like_generic_loops(name):
+    text, counted = COUNTED_LOOPS[name]
+    tree = compile_source(text)
+    loops = [node for node in walk(tree) if isinstance(node, For)]
+    assert (loops[0].counted is not None) == counted
+    assert run_tree(tree) == run_tree(unoptimized(text))
@@ -0,0 +1,151 @@
+import pytest
+
+import inu_parallel
+from inu_exceptions import InumakiException
+from inu_interpreter import Interpreter
+from inu_modules import compile_source
+from inu_output import Output
+from inu_stdlib import create_scope
+
+PROGRAMS = {
+    "values": """Tuna_Mayo charge Tuna n Tuna {
+    Tuna x Tuna n * 2
+    Return x
+}
+Tuna_Tuna(Parallel_Map(charge, 40))
+""",
+    "output in order": """Tuna_Mayo speak Tuna n Tuna {
+    Tuna_Tuna("at", n)
+    Return n
+}
+Tuna_Tuna(Parallel_Map(speak, 60))
+""",
+    "cough syrup": """Tuna_Mayo soothe Tuna n Tuna {
+    Cough_Syrup
+    Tuna_Tuna(n)
+    Return n
+}
+Tuna_Tuna(Parallel_Map(soothe, 100))
+""",
+    "cursed speech overload": """Tuna_Mayo crush Tuna n Tuna {
+    Return n
+}
+Tuna_Tuna(Parallel_Map(crush, 200))
+""",
+    "no return": """Tuna base Tuna 1
+Tuna_Mayo grow Tuna n Tuna {
+    Tuna base Tuna base + n
+    Tuna_Tuna(base)
+}
+Tuna_Tuna(Parallel_Map(grow, 6))
+Tuna_Tuna(base)
+""",
+    "error": """Tuna_Mayo inverse Tuna n Tuna {
+    Return 10 / (5 - n)
+}
+Tuna_Tuna(Parallel_Map(inverse, 10))
+""",
+    "reduce": """Tuna_Mayo square Tuna n Tuna {
+    Return n * n
+}
+Tuna_Mayo add Tuna a b Tuna {
+    Return a + b
+}
+Tuna_Tuna(Parallel_Reduce(square, add, 20, 0))
+""",
+    "functions reaching other functions": """Tuna_Mayo fib Tuna n Tuna {
+    Mustard_Leaf Tuna n < 2 Tuna {
+        Return n
+    }
+    Return fib(n - 1) + fib(n - 2)
+}
+Tuna_Mayo twice Tuna f n Tuna {
+    Return f(n) * 2
+}
+Tuna_Mayo go Tuna n Tuna {
+    Cough_Syrup
+    Return twice(fib, n % 5)
+}
+Tuna_Tuna(Parallel_Map(go, 12))
+""",
+}
+
+
+@pytest.fixture(autouse=True)
+def pool():
+    yield
+    if inu_parallel._pool is not None:
+        inu_parallel._pool.shutdown()
+        inu_parallel._pool = None
+
+
+def run(text, workers, monkeypatch):
+    """Output, final scope values, cursed count and error message of a run with `workers` workers."""
+    monkeypatch.setattr(inu_parallel, "WORKERS", workers)
+    output = Output.memory()
+    interpreter = Interpreter(compile_source(text), scope=create_scope(output), cursed=0, output=output)
+    error = None
+    try:
+        interpreter.run()
+    except InumakiException as e:
+        error = str(e)
+    values = {name: value for name, value in interpreter.scope.items() if not callable(value)}
+    return output.getvalue(), values, interpreter.cursed, error
+
+
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_workers_match_sequential_calls(name, monkeypatch):
+    shipped = []
+    run_parallel = inu_parallel.run_parallel
+
+    def spy(function, items):
+        shipment, outcomes = run_parallel(function, items)
+        shipped.append(None if outcomes is None else len(outcomes))
+        return shipment, outcomes
+
+    sequential = run(PROGRAMS[name], 1, monkeypatch)
+    monkeypatch.setattr(inu_parallel, "run_parallel", spy)
+    assert run(PROGRAMS[name], 2, monkeypatch) == sequential
+    if name == "no return":
+        assert shipped == [0]  # the first call keeps its scope, so the parent runs every call
+    else:
+        assert shipped and all(shipped)  # the workers really made the calls
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        """Salmon_Roe collections
+Tuna xs Tuna collections.list()
+Tuna_Mayo f Tuna n Tuna {
+    collections.push(xs, n)
+    Return n
+}
+Tuna_Tuna(Parallel_Map(f, 10))
+Tuna_Tuna(xs)
+""",
+        """Salmon_Roe collections
+Tuna seen Tuna collections.dict()
+Tuna_Mayo f Tuna n Tuna {
+    collections.put(seen, n, Salmon)
+    Return n
+}
+Tuna_Tuna(Parallel_Map(f, 5))
+Tuna_Tuna(seen)
+""",
+        """Salmon_Roe collections
+Tuna_Mayo f Tuna item Tuna {
+    collections.push(item, 1)
+    Return 0
+}
+Tuna items Tuna collections.list(collections.list(), collections.list())
+Tuna_Tuna(Parallel_Map(f, items))
+Tuna_Tuna(items)
+""",
+    ],
+    ids=["list captured through a module", "dict captured through a module", "list items"],
+)
+def test_shared_containers_are_changed_in_the_parent(text, monkeypatch):
+    sequential = run(text, 1, monkeypatch)
+    assert run(text, 2, monkeypatch)[0] == sequential[0]
+    assert "[]" not in sequential[0] and "{}" not in sequential[0]
@@ -0,0 +1,111 @@
+import pickle
+
+import pytest
+
+from inu_interpreter import Interpreter
+from inu_modules import compile_source
+from inu_operators import add
+from inu_output import Output
+from inu_rope import Rope, flatten
+from inu_stdlib import create_scope
+
+
+def run(text, **names):
+    output = Output.memory()
+    scope = create_scope(output)
+    scope.update(names)
+    Interpreter(compile_source(text), scope, 0, output=output).run()
+    return output.getvalue(), scope
+
+
+def test_ropes_sharing_parts_keep_their_own_values():
+    s = add("a", "")
+    t = s + "b"
+    u = s + "c"
+    v = t + "d"
+    w = t + "e"
+    x = u + "f"
+    assert [flatten(value) for value in (s, t, u, v, w, x)] == ["a", "ab", "ac", "abd", "abe", "acf"]
+    assert [len(value) for value in (s, t, u, v, w, x)] == [1, 2, 2, 3, 3, 3]
+
+
+def test_appending_to_an_older_rope_after_flattening_the_newer_one():
+    t = add("a", "b")
+    v = t + "c"
+    assert flatten(v) == "abc"
+    w = t + "d"
+    assert (flatten(t), flatten(v), flatten(w)) == ("ab", "abc", "abd")
+
+
+def test_aliasing_in_a_program():
+    text = ('Tuna s Tuna "a"\nTuna t Tuna s + "b"\nTuna u Tuna s + "c"\nTuna v Tuna t + "d"\nTuna w Tuna t + "e"\n'
+            "Tuna_Tuna(s, t, u, v, w)\n")
+    assert run(text)[0] == "a ab ac abd abe\n"
+
+
+@pytest.mark.parametrize("left, right, expected", [
+    (add("a", "b"), "ab", (True, False, False, True, False, True)),
+    ("ab", add("a", "b"), (True, False, False, True, False, True)),
+    (add("a", "b"), add("a", "c"), (False, True, True, True, False, False)),
+    (add("b", ""), "a", (False, True, False, False, True, True)),
+    ("a", add("b", ""), (False, True, True, True, False, False)),
+])
+def test_rope_and_str_compare_by_value(left, right, expected):
+    assert (left == right, left != right, left < right, left <= right, left > right, left >= right) == expected
+
+
+def test_rope_hashes_like_its_str():
+    rope = add("a", "b")
+    assert hash(rope) == hash("ab")
+    assert {"ab": 1}[rope] == 1
+    assert rope in {"ab"}
+
+
+def test_rope_compares_unequal_to_other_types():
+    assert add("1", "") != 1
+    assert not add("1", "") == 1
+    with pytest.raises(TypeError):
+        add("a", "") < 1
+
+
+def test_rope_operations_match_str():
+    rope = add("ab", "c")
+    assert rope[1] == "b" and rope[-1] == "c" and rope[0:2] == "ab"
+    assert rope * 2 == "abcabc" and 2 * rope == "abcabc"
+    assert add("%s!", "") % "x" == "x!"
+    assert "x" + rope == "xabc" and type("x" + rope) is Rope
+    assert bool(add("", "")) is False
+    assert repr(rope) == "'abc'"
+    with pytest.raises(TypeError):
+        rope + 1
+    with pytest.raises(TypeError):
+        add("a", 1)
+
+
+def test_rope_pickles_as_str():
+    copy = pickle.loads(pickle.dumps(add("a", "b")))
+    assert type(copy) is str and copy == "ab"
+
+
+def test_native_functions_get_plain_strings():
+    seen = []
+
+    def native(*values):
+        seen.extend(type(value) for value in values)
+        return len(values)
+
+    run('Tuna s Tuna "a"\nTuna s Tuna s + "b"\nTuna n Tuna native(s, s + "c", 1)\nTuna m Tuna str(s)\n',
+        native=native)
+    assert seen == [str, str, int]
+
+
+def test_inumaki_functions_keep_ropes():
+    output, scope = run('Tuna_Mayo keep Tuna x Tuna {\n    Return x\n}\nTuna s Tuna "a"\nTuna t Tuna keep(s + "b")\n')
+    assert type(scope["t"]) is Rope and scope["t"] == "ab"
+
+
+def test_get_flattens_ropes():
+    output, scope = run('Tuna s Tuna "a"\nTuna s Tuna s + "bc"\nTuna first Tuna s[0]\nTuna last Tuna s[2]\n'
+                        "Tuna value Tuna table[s]\n", table={"abc": 7})
+    assert (scope["first"], scope["last"], scope["value"]) == ("a", "c", 7)
+    assert type(scope["first"]) is str
@@ -0,0 +1,106 @@
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+import inu_server
+from inu_client import Client
+from inu_server import CompileCache, prepare_socket_path, serve_stream
+
+CLIENT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "inumaki", "inu_client.py")
+
+
+def serve(*lines):
+    writer = io.BytesIO()
+    serve_stream(io.BytesIO("".join(line + "\n" for line in lines).encode()), writer, CompileCache())
+    return [json.loads(line) for line in writer.getvalue().splitlines()]
+
+
+def test_runs_source():
+    (response,) = serve(json.dumps({"id": 1, "source": "Tuna_Tuna(1 + 2)"}))
+    assert response["output"] == "3\n"
+    assert response["status"] == 0
+
+
+def test_requests_that_are_not_objects_get_an_error_and_the_server_keeps_going():
+    responses = serve("[1]", '"x"', "3", "not json", json.dumps({"id": 2, "source": "Tuna_Tuna(1)"}))
+    for response in responses[:4]:
+        assert response["status"] == 1
+        assert response["error"].startswith("Invalid request")
+    assert responses[4]["output"] == "1\n"
+
+
+def test_session_keeps_names_between_requests():
+    responses = serve(
+        json.dumps({"id": 1, "source": "Tuna x Tuna 5", "session": "repl"}),
+        json.dumps({"id": 2, "source": "Tuna_Tuna(x)", "session": "repl"}),
+        json.dumps({"id": 3, "source": "Tuna_Tuna(x)"}),
+    )
+    assert responses[1]["output"] == "5\n"
+    assert responses[2]["status"] == 1
+    assert "Undefined variable" in responses[2]["error"]
+
+
+def test_session_output_is_split_between_requests():
+    responses = serve(
+        json.dumps({"source": "Tuna_Tuna(1)", "session": 1}),
+        json.dumps({"source": "Tuna_Tuna(2)", "session": 1}),
+    )
+    assert [response["output"] for response in responses] == ["1\n", "2\n"]
+
+
+def test_profile_reports_the_specializations_of_the_run():
+    source = "Tuna y Tuna 0.5\nTwist Tuna Tuna i Tuna 0 Tuna i < 20 Tuna Tuna i Tuna i + 1 Tuna {\n    Tuna y Tuna y * 1.5\n}"
+    (response,) = serve(json.dumps({"source": source, "profile": True}))
+    assert response["profile"]["specialized"] == 1
+    assert response["profile"]["float * float"] == 1
+
+
+def test_client_without_a_server_exits_with_one_line(tmp_path):
+    path = str(tmp_path / "missing.sock")
+    script = tmp_path / "a.inu"
+    script.write_text("Tuna_Tuna(1)\n")
+    result = subprocess.run([sys.executable, CLIENT, "--socket", path, str(script)], capture_output=True, text=True)
+    assert result.returncode == 1
+    assert result.stderr == f"inumaki-client: no inumaki server at {path}\n"
+
+
+def test_client_only_talks_to_sockets(tmp_path):
+    path = tmp_path / "plain"
+    path.write_text("")
+    with pytest.raises(ConnectionError, match="not an inumaki server socket"):
+        Client(str(path))
+
+
+def test_stale_socket_is_replaced_but_other_files_are_not(tmp_path):
+    stale = str(tmp_path / "stale.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(stale)
+    listener.close()
+    prepare_socket_path(stale)
+    assert not os.path.exists(stale)
+
+    plain = tmp_path / "plain"
+    plain.write_text("keep")
+    with pytest.raises(FileExistsError):
+        prepare_socket_path(str(plain))
+    assert plain.read_text() == "keep"
+
+
+def test_private_socket_directory_is_created_for_the_owner_only(tmp_path, monkeypatch):
+    directory = tmp_path / "inumaki-private"
+    monkeypatch.setattr(inu_server, "PRIVATE_DIRECTORY", str(directory))
+    old = os.umask(0)
+    try:
+        prepare_socket_path(str(directory / "inumaki.sock"))
+    finally:
+        os.umask(old)
+    assert os.stat(directory).st_mode & 0o777 == 0o700
+
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        prepare_socket_path(str(directory / "inumaki.sock"))
@@ -0,0 +1,90 @@
+import pytest
+
+from inu_check import check_source
+from inu_exceptions import InumakiSyntaxError
+from inu_interpreter import Interpreter
+from inu_modules import compile_source
+from inu_output import Output
+from inu_stdlib import create_scope
+
+# `crush` and `blast` are cursed words: reading crush costs 1 and calling blast() costs 4 in all.
+# Cough_Syrup starts the expression at zero.
+PRELUDE = """Tuna t Tuna Salmon
+Tuna f Tuna Bonito_Flakes
+Tuna crush Tuna 1
+Tuna_Mayo blast Tuna Tuna {
+    Return crush
+}
+Cough_Syrup
+"""
+
+# expression -> (cursed count after it runs, lower bound, upper bound from inumaki check)
+CASES = {
+    "Salmon And crush": (1, 1, 1),
+    "Salmon And blast()": (4, 4, 4),
+    "Bonito_Flakes And crush": (0, 0, 0),
+    "Bonito_Flakes And blast()": (0, 0, 0),
+    "t And crush": (1, 0, 1),
+    "t And blast()": (4, 0, 4),
+    "f And crush": (0, 0, 1),
+    "f And blast()": (0, 0, 4),
+    "crush And crush": (2, 1, 2),
+    "crush And blast()": (5, 1, 5),
+    "Salmon Or crush": (0, 0, 0),
+    "Salmon Or blast()": (0, 0, 0),
+    "Bonito_Flakes Or crush": (1, 1, 1),
+    "Bonito_Flakes Or blast()": (4, 4, 4),
+    "t Or crush": (0, 0, 1),
+    "t Or blast()": (0, 0, 4),
+    "f Or crush": (1, 0, 1),
+    "f Or blast()": (4, 0, 4),
+    "crush Or crush": (1, 1, 2),
+    "crush Or blast()": (1, 1, 5),
+    "Not crush": (1, 1, 1),
+    "Not Bonito_Flakes": (0, 0, 0),
+    "Not blast()": (4, 4, 4),
+    "Not t And crush": (0, 0, 1),
+    "Not f And blast()": (4, 0, 4),
+    "Not f Or blast()": (0, 0, 4),
+    "crush != 2": (1, 1, 1),
+    "crush != crush": (2, 2, 2),
+    "blast() != crush": (5, 5, 5),
+}
+
+
+def run(expression):
+    output = Output.memory()
+    interpreter = Interpreter(compile_source(PRELUDE + f"Tuna r Tuna {expression}\n"), scope=create_scope(output),
+                              cursed=0, output=output)
+    interpreter.run()
+    return interpreter
+
+
+@pytest.mark.parametrize("expression", CASES)
+def test_cursed_count_and_bounds(expression):
+    cursed, lower, upper = CASES[expression]
+    assert run(expression).cursed == cursed
+    report = check_source(PRELUDE + f"Tuna r Tuna {expression}\n")
+    assert (report.final.lower, report.final.upper) == (lower, upper)
+
+
+@pytest.mark.parametrize(
+    "expression, value",
+    [
+        ("Salmon And crush", 1),
+        ("Bonito_Flakes And crush", False),
+        ("Salmon Or crush", True),
+        ("Bonito_Flakes Or crush", 1),
+        ("Not crush", False),
+        ("Not Bonito_Flakes", True),
+        ("crush != 2", True),
+        ("crush != crush", False),
+    ],
+)
+def test_value(expression, value):
+    assert run(expression).scope["r"] == value
+
+
+def test_lone_exclamation_mark_is_a_syntax_error():
+    with pytest.raises(InumakiSyntaxError):
+        compile_source("Tuna r Tuna !Salmon\n")
@@ -0,0 +1,105 @@
+import os
+import subprocess
+import sys
+from collections import Counter
+
+import pytest
+
+import inu_specialize
+from inu_interpreter import Interpreter
+from inu_modules import compile_source
+from inu_output import Output
+from inu_specialize import RESPECIALIZATIONS, WARMUP
+from inu_stdlib import create_scope
+
+INUMAKI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "inumaki", "inumaki.py")
+
+
+@pytest.fixture(autouse=True)
+def profile(monkeypatch):
+    counts = Counter()
+    monkeypatch.setattr(inu_specialize, "profile", counts)
+    return counts
+
+
+def run(tree, **names):
+    """Run a compiled tree again with these names bound, returning its scope."""
+    scope = create_scope(Output.memory())
+    scope.update(names)
+    return Interpreter(tree, scope, 0).run()
+
+
+def compile_op(op):
+    tree = compile_source(f"Tuna z Tuna x {op} y")
+    return tree, tree[0].value
+
+
+def test_node_specializes_after_warmup(profile):
+    tree, node = compile_op("*")
+    for count in range(WARMUP - 1):
+        assert run(tree, x=1.5, y=2.0)["z"] == 3.0
+    assert node.fast is None and profile["specialized"] == 0
+    run(tree, x=1.5, y=2.0)
+    assert node.fast == float.__mul__
+    assert profile == Counter({"specialized": 1, "float * float": 1})
+    assert run(tree, x=2.5, y=2.0)["z"] == 5.0
+
+
+def test_mixed_operand_types_stay_generic(profile):
+    tree, node = compile_op("+")
+    for count in range(WARMUP):
+        run(tree, x=1, y=1.5 if count % 2 else 1)
+    assert node.fast is None and node.warmup == 0
+    assert profile == Counter({"generic": 1})
+
+
+def test_guard_miss_falls_back_and_warms_up_again(profile):
+    tree, node = compile_op("+")
+    for count in range(WARMUP):
+        run(tree, x=1, y=2)
+    assert node.fast == int.__add__
+    assert run(tree, x=1.5, y=2)["z"] == 3.5  # float + int misses the int guard
+    assert node.fast is None and node.warmup == WARMUP
+    assert node.respecializations == RESPECIALIZATIONS - 1
+    for count in range(WARMUP):
+        assert run(tree, x=1.5, y=2)["z"] == 3.5
+    assert node.fast == float.__add__
+    assert profile["guard failures"] == 1 and profile["specialized"] == 2
+
+
+def test_node_despecializes_after_repeated_misses(profile):
+    tree, node = compile_op("-")
+    for attempt in range(RESPECIALIZATIONS + 1):
+        for count in range(WARMUP):
+            run(tree, x=5, y=2)
+        assert node.fast == int.__sub__
+        assert run(tree, x=5.5, y=2)["z"] == 3.5
+    assert node.fast is None and node.warmup == 0
+    assert run(tree, x=5, y=2)["z"] == 3
+    assert profile["guard failures"] == RESPECIALIZATIONS + 1
+    assert profile["despecialized"] == 1
+
+
+@pytest.mark.parametrize("op", ["-", "/", "*"])
+def test_string_operands_without_a_fast_path_keep_the_generic_error(op):
+    tree = compile_source(f'Tuna x Tuna "a" {op} "b"')
+    messages = set()
+    for count in range(WARMUP * 2):
+        with pytest.raises(TypeError) as info:
+            run(tree)
+        messages.add(str(info.value))
+    assert tree[0].value.fast is None
+    assert len(messages) == 1
+
+
+def test_profile_option_prints_the_counts(tmp_path):
+    script = tmp_path / "loop.inu"
+    script.write_text("Tuna y Tuna 1.5\nTwist Tuna Tuna i Tuna 0 Tuna i < 20 Tuna Tuna i Tuna i + 1 Tuna {\n"
+                      "    Tuna y Tuna y * 1.5\n}\n")
+    result = subprocess.run([sys.executable, INUMAKI, "--profile", str(script)], capture_output=True, text=True)
+    assert result.returncode == 0
+    lines = result.stderr.splitlines()
+    assert lines[0] == "Specialization profile:"
+    assert "  operator nodes specialized: 1" in lines
+    assert "  guard failures: 0" in lines
+    assert "  float * float: 1" in lines